@@ -21,6 +21,7 @@ from firebase_admin import credentials, firestore
 from firebase_admin.exceptions import FirebaseError
 
 from config import APIConfig, TradingConfig
+from utils import setup_event_loop_policy
 
 
 class BinanceLiveService:
@@ -307,6 +308,7 @@ class BinanceLiveService:
             start_time = end_time - timedelta(hours=hours_back)
             
             all_trades = []
+            trade_times = []  # Horodatages Binance (ms) alignés sur all_trades, pour le tri
             
             for symbol in self.monitored_pairs:
                 try:
@@ -332,6 +334,7 @@ class BinanceLiveService:
                             'isBestMatch': trade['isBestMatch']
                         }
                         all_trades.append(trade_data)
+                        trade_times.append(trade['time'])
                     
                     # Petite pause pour éviter rate limits
                     await asyncio.sleep(0.1)
@@ -341,6 +344,11 @@ class BinanceLiveService:
                         self.logger.warning(f"[TRADES] Erreur {symbol}: {e}")
                     continue
             
+            # Les trades arrivent groupés par paire: tri global du plus récent au plus ancien
+            # sur les horodatages entiers, une seule fois ici plutôt qu'à chaque lecture
+            order = sorted(range(len(all_trades)), key=trade_times.__getitem__, reverse=True)
+            all_trades = [all_trades[i] for i in order]
+            
             trades_data = {
                 'timestamp': datetime.now().isoformat(),
                 'period_hours': hours_back,
@@ -509,5 +517,8 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Proactor sous Windows, uvloop ailleurs si installé
+    setup_event_loop_policy()
+    
     exit_code = asyncio.run(main())
     exit(exit_code)
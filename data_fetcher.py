@@ -7,22 +7,62 @@ Gestion des API calls, cache et optimisations
 import asyncio
 import logging
 import time
-from typing import Dict, List, Optional, Any
+from collections import deque
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 
 try:
     from binance.client import Client
     from binance.exceptions import BinanceAPIException, BinanceOrderException
+    from requests.adapters import HTTPAdapter
     import ccxt.async_support as ccxt
 except ImportError:
     print("⚠️ Modules Binance manquants. Installez avec: pip install python-binance ccxt")
     Client = None
     ccxt = None
 
+try:
+    from binance import AsyncClient, BinanceSocketManager
+    BINANCE_WS_AVAILABLE = True
+except ImportError:
+    BINANCE_WS_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if Client and ORJSON_AVAILABLE:
+    from binance.exceptions import BinanceRequestException
+    
+    class _BinanceClient(Client):
+        """Client Binance dont les réponses REST (klines, tickers...) sont décodées par orjson"""
+        
+        @staticmethod
+        def _handle_response(response):
+            if not (200 <= response.status_code < 300):
+                raise BinanceAPIException(response, response.status_code, response.text)
+            try:
+                return orjson.loads(response.content)
+            except ValueError:
+                raise BinanceRequestException('Invalid Response: %s' % response.text)
+else:
+    _BinanceClient = Client
+
 
 class DataFetcher:
     """Gestionnaire de récupération des données de marché"""
     
+    # Connexions HTTP keep-alive gardées par le client Binance (requêtes parallèles via asyncio.to_thread)
+    HTTP_POOL_SIZE = 32
+    
+    # Flux klines considéré mort sans message depuis ce délai (secondes)
+    KLINE_STREAM_STALE_SECONDS = 60
+    
+    # Flux !miniTicker@arr (poussé chaque seconde) considéré mort au-delà de ce délai
+    PRICE_STREAM_STALE_SECONDS = 10
+    
     def __init__(self, api_key: str, secret_key: str, testnet: bool = False):
         self.api_key = api_key
         self.secret_key = secret_key
@@ -37,13 +77,38 @@ class DataFetcher:
         self.binance_client = None
         self.ccxt_client = None
         
+        # Flux WebSocket des klines: bougies clôturées par paire + bougie en cours
+        self.stream_klines: Dict[str, deque] = {}
+        self.stream_current: Dict[str, List] = {}
+        self._stream_pairs = frozenset()
+        self._stream_task: Optional[asyncio.Task] = None
+        self._stream_client = None
+        self._stream_last_message = 0.0
+        
+        # Flux compte (soldes, exécutions) et prix miniTicker, lus sans I/O par la surveillance des positions
+        self.stream_balances: Dict[str, Dict[str, str]] = {}
+        self.stream_balance_amounts: Dict[str, Tuple[float, float]] = {}  # asset -> (free, locked) en float
+        self.stream_prices: Dict[str, float] = {}
+        self.last_fills: Dict[str, Dict] = {}
+        self._account_tasks: List[asyncio.Task] = []
+        self._user_stream_connected = False
+        self._prices_last_message = 0.0
+        
+        # Signalé à chaque bougie clôturée, changement de solde ou ordre exécuté (réveil de la boucle principale)
+        self.market_event = asyncio.Event()
+        
         if Client and api_key and secret_key:
             try:
-                self.binance_client = Client(
+                self.binance_client = _BinanceClient(
                     api_key=api_key,
                     api_secret=secret_key,
                     testnet=testnet
                 )
+                
+                # Pool keep-alive dimensionné pour les appels concurrents (10 par défaut: au-delà,
+                # chaque requête parallèle rouvrait une connexion TCP+TLS)
+                adapter = HTTPAdapter(pool_connections=self.HTTP_POOL_SIZE, pool_maxsize=self.HTTP_POOL_SIZE)
+                self.binance_client.session.mount('https://', adapter)
                 self.logger.info(f"📊 Client Binance initialisé (Testnet: {testnet})")
             except Exception as e:
                 self.logger.error(f"❌ Erreur initialisation Binance: {e}")
@@ -55,6 +120,8 @@ class DataFetcher:
                     'secret': secret_key,
                     'sandbox': testnet,
                     'enableRateLimit': True,
+                    # 10s par défaut: trop court pour une première connexion TCP+TLS à froid
+                    'timeout': 30000,
                 })
                 self.logger.info("📊 Client CCXT initialisé")
             except Exception as e:
@@ -67,7 +134,7 @@ class DataFetcher:
         
         try:
             # Test avec l'endpoint de statut du serveur
-            status = self.binance_client.get_system_status()
+            status = await asyncio.to_thread(self.binance_client.get_system_status)
             
             if status['status'] == 0:
                 self.logger.info("✅ Connexion Binance testée avec succès")
@@ -191,8 +258,7 @@ class DataFetcher:
             
         except Exception as e:
             self.logger.warning(f"⚠️ Erreur arrondi quantité: {e}, utilisation quantité originale")
-            import traceback
-            self.logger.debug(f"🔍 Traceback: {traceback.format_exc()}")
+            self.logger.debug("🔍 Traceback:", exc_info=True)
             return quantity
     
     def round_price(self, symbol_info: Dict, price: float) -> float:
@@ -255,8 +321,9 @@ class DataFetcher:
         
         try:
             if self.binance_client:
-                # Utilisation du client Binance officiel
-                klines = self.binance_client.get_klines(
+                # Utilisation du client Binance officiel (client synchrone -> thread pour ne pas bloquer la boucle)
+                klines = await asyncio.to_thread(
+                    self.binance_client.get_klines,
                     symbol=symbol,
                     interval=interval,
                     limit=limit,
@@ -320,6 +387,260 @@ class DataFetcher:
             self.logger.error(f"❌ Erreur récupération klines {symbol}: {e}")
             raise
     
+    async def start_kline_stream(self, symbols: List[str], interval: str = "1m", maxlen: int = 100):
+        """
+        Abonne les paires au flux WebSocket <paire>@kline_<interval> (multiplex)
+        
+        Les nouvelles paires sont amorcées une fois par REST; ensuite le flux alimente
+        stream_klines/stream_current sans aucune requête. Ne fait rien si les paires
+        n'ont pas changé et que le flux tourne encore.
+        """
+        if not BINANCE_WS_AVAILABLE:
+            return
+        
+        pairs = frozenset(symbols)
+        if pairs == self._stream_pairs and self._stream_task and not self._stream_task.done():
+            return
+        
+        await self.stop_kline_stream()
+        
+        # Amorçage REST des paires sans historique
+        missing = [pair for pair in pairs if pair not in self.stream_klines]
+        results = await asyncio.gather(
+            *(self.get_klines(pair, interval, limit=maxlen) for pair in missing),
+            return_exceptions=True
+        )
+        for pair, klines in zip(missing, results):
+            if isinstance(klines, Exception) or not klines:
+                continue
+            self.stream_klines[pair] = deque(klines[:-1], maxlen=maxlen)
+            self.stream_current[pair] = klines[-1]
+        
+        for pair in list(self.stream_klines):
+            if pair not in pairs:
+                del self.stream_klines[pair]
+                self.stream_current.pop(pair, None)
+        
+        self._stream_pairs = pairs
+        self._stream_last_message = time.monotonic()
+        self._stream_task = asyncio.create_task(self._run_kline_stream(sorted(pairs), interval, maxlen))
+        self.logger.info(f"📡 Flux klines WebSocket démarré ({len(pairs)} paires)")
+    
+    async def _run_kline_stream(self, symbols: List[str], interval: str, maxlen: int):
+        """Boucle de réception du flux multiplex, reconnexion automatique en cas d'erreur"""
+        streams = [f"{symbol.lower()}@kline_{interval}" for symbol in symbols]
+        
+        while True:
+            try:
+                socket_manager = BinanceSocketManager(await self._get_stream_client())
+                
+                async with socket_manager.multiplex_socket(streams) as stream:
+                    while True:
+                        message = await stream.recv()
+                        data = message.get('data') if message else None
+                        if not data or data.get('e') != 'kline':
+                            if data and data.get('e') == 'error':
+                                raise Exception(data.get('m'))
+                            continue
+                        
+                        self._stream_last_message = time.monotonic()
+                        self._on_stream_kline(data['s'], data['k'], maxlen)
+                        
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"❌ Erreur flux klines WebSocket: {e}")
+                await asyncio.sleep(5)
+    
+    def _on_stream_kline(self, symbol: str, k: Dict, maxlen: int):
+        """Met à jour la bougie en cours et archive les bougies clôturées"""
+        kline = [
+            int(k['t']),        # Open time
+            float(k['o']),      # Open
+            float(k['h']),      # High
+            float(k['l']),      # Low
+            float(k['c']),      # Close
+            float(k['v']),      # Volume
+            int(k['T']),        # Close time
+            float(k['q']),      # Quote asset volume
+            int(k['n']),        # Number of trades
+            float(k['V']),      # Taker buy base asset volume
+            float(k['Q']),      # Taker buy quote asset volume
+            k.get('B', "")      # Ignore
+        ]
+        
+        if k['x']:
+            candles = self.stream_klines.setdefault(symbol, deque(maxlen=maxlen))
+            if not candles or candles[-1][0] < kline[0]:
+                candles.append(kline)
+                self.market_event.set()
+        self.stream_current[symbol] = kline
+    
+    def get_stream_klines(self, symbol: str, limit: int = 100) -> Optional[List[List]]:
+        """
+        Dernières klines (bougie en cours incluse) issues du flux WebSocket, sans I/O
+        
+        Returns:
+            None si la paire n'est pas suivie, le flux arrêté/inactif ou l'historique trop court
+        """
+        if symbol not in self._stream_pairs or not self._stream_task or self._stream_task.done():
+            return None
+        if time.monotonic() - self._stream_last_message > self.KLINE_STREAM_STALE_SECONDS:
+            return None
+        
+        candles = self.stream_klines.get(symbol)
+        current = self.stream_current.get(symbol)
+        if not candles or current is None or len(candles) < limit - 1:
+            return None
+        
+        closed = list(candles)[-(limit - 1):] if limit > 1 else []
+        if closed and current[0] <= closed[-1][0]:
+            # Bougie en cours pas encore remplacée après sa clôture
+            return None
+        return closed + [current]
+    
+    async def _get_stream_client(self):
+        """Client asynchrone partagé par tous les flux WebSocket (clés requises pour le flux compte)"""
+        if self._stream_client is None:
+            self._stream_client = await AsyncClient.create(
+                self.api_key or None, self.secret_key or None, testnet=self.testnet
+            )
+        return self._stream_client
+    
+    async def start_account_streams(self):
+        """
+        Démarre le flux userData (soldes, ordres exécutés) et le flux !miniTicker@arr (prix)
+        
+        python-binance gère la création du listenKey et son keep-alive toutes les 30 minutes.
+        """
+        if not BINANCE_WS_AVAILABLE or not (self.api_key and self.secret_key):
+            return
+        if self._account_tasks and not any(task.done() for task in self._account_tasks):
+            return
+        
+        await self.stop_account_streams()
+        self._account_tasks = [
+            asyncio.create_task(self._run_user_stream()),
+            asyncio.create_task(self._run_price_stream())
+        ]
+        self.logger.info("📡 Flux WebSocket compte et prix démarrés")
+    
+    async def _run_user_stream(self):
+        """Boucle du flux userData; les soldes sont réamorcés par REST à chaque (re)connexion"""
+        while True:
+            try:
+                socket_manager = BinanceSocketManager(await self._get_stream_client())
+                
+                async with socket_manager.user_socket() as stream:
+                    # Amorçage après ouverture: aucun événement perdu entre la lecture REST et le flux
+                    self.stream_balances = await self.get_account_balance()
+                    self.stream_balance_amounts = self.balance_amounts(self.stream_balances)
+                    self._user_stream_connected = True
+                    
+                    while True:
+                        self._on_user_event(await stream.recv())
+                        
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"❌ Erreur flux compte WebSocket: {e}")
+                await asyncio.sleep(5)
+            finally:
+                self._user_stream_connected = False
+    
+    def _on_user_event(self, event: Dict):
+        """Applique un événement userData (soldes modifiés, ordre exécuté)"""
+        event_type = event.get('e') if event else None
+        
+        if event_type == 'outboundAccountPosition':
+            for balance in event['B']:
+                free = float(balance['f'])
+                locked = float(balance['l'])
+                if free > 0 or locked > 0:
+                    self.stream_balances[balance['a']] = {
+                        'free': balance['f'],
+                        'locked': balance['l'],
+                        'total': str(free + locked)
+                    }
+                    self.stream_balance_amounts[balance['a']] = (free, locked)
+                else:
+                    self.stream_balances.pop(balance['a'], None)
+                    self.stream_balance_amounts.pop(balance['a'], None)
+            self.market_event.set()
+        
+        elif event_type == 'executionReport' and event.get('X') == 'FILLED':
+            self.last_fills[event['s']] = event
+            self.market_event.set()
+        
+        elif event_type == 'error':
+            raise Exception(event.get('m'))
+    
+    async def _run_price_stream(self):
+        """Boucle du flux !miniTicker@arr: dernier prix de toutes les paires"""
+        while True:
+            try:
+                socket_manager = BinanceSocketManager(await self._get_stream_client())
+                
+                async with socket_manager.miniticker_socket() as stream:
+                    while True:
+                        message = await stream.recv()
+                        if isinstance(message, dict):
+                            if message.get('e') == 'error':
+                                raise Exception(message.get('m'))
+                            continue
+                        
+                        self._prices_last_message = time.monotonic()
+                        for ticker in message:
+                            self.stream_prices[ticker['s']] = float(ticker['c'])
+                        
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"❌ Erreur flux prix WebSocket: {e}")
+                await asyncio.sleep(5)
+    
+    def get_stream_balances(self) -> Optional[Dict[str, Dict[str, str]]]:
+        """Soldes tenus à jour par le flux userData (même format que get_account_balance), None si indisponible"""
+        if not self._user_stream_connected:
+            return None
+        return self.stream_balances
+    
+    def get_stream_balance_amounts(self) -> Optional[Dict[str, Tuple[float, float]]]:
+        """Soldes (free, locked) déjà convertis en float par le flux userData, None si indisponible"""
+        if not self._user_stream_connected:
+            return None
+        return self.stream_balance_amounts
+    
+    @staticmethod
+    def balance_amounts(balances: Dict[str, Dict[str, str]]) -> Dict[str, Tuple[float, float]]:
+        """Convertit un résultat de get_account_balance en {asset: (free, locked)}"""
+        return {asset: (float(balance['free']), float(balance['locked'])) for asset, balance in balances.items()}
+    
+    def get_stream_price(self, symbol: str) -> Optional[float]:
+        """Dernier prix reçu par le flux miniTicker, None si le flux est arrêté ou inactif"""
+        if time.monotonic() - self._prices_last_message > self.PRICE_STREAM_STALE_SECONDS:
+            return None
+        return self.stream_prices.get(symbol)
+    
+    async def stop_account_streams(self):
+        """Arrête les flux compte et prix"""
+        for task in self._account_tasks:
+            task.cancel()
+        if self._account_tasks:
+            await asyncio.gather(*self._account_tasks, return_exceptions=True)
+        self._account_tasks = []
+    
+    async def stop_kline_stream(self):
+        """Arrête la tâche du flux klines (l'historique est conservé)"""
+        if self._stream_task:
+            self._stream_task.cancel()
+            try:
+                await self._stream_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._stream_task = None
+        self._stream_pairs = frozenset()
+    
     async def get_ticker_price(self, symbol: str) -> Dict[str, str]:
         """Récupère le prix actuel d'une paire"""
         cache_key = f"ticker_{symbol}"
@@ -360,7 +681,8 @@ class DataFetcher:
         
         try:
             if self.binance_client:
-                tickers = self.binance_client.get_ticker()
+                # Client synchrone -> thread pour ne pas bloquer la boucle
+                tickers = await asyncio.to_thread(self.binance_client.get_ticker)
                 
                 # Filtrage pour USDC uniquement
                 usdc_tickers = [
@@ -422,7 +744,8 @@ class DataFetcher:
         
         try:
             if self.binance_client:
-                exchange_info = self.binance_client.get_exchange_info()
+                # Client synchrone -> thread pour ne pas bloquer la boucle d'événements
+                exchange_info = await asyncio.to_thread(self.binance_client.get_exchange_info)
                 
                 # Extraction des paires actives
                 pairs = []
@@ -457,7 +780,8 @@ class DataFetcher:
         """Récupère les statistiques 24h d'une paire spécifique"""
         try:
             if self.binance_client:
-                ticker = self.binance_client.get_ticker(symbol=symbol)
+                # Client synchrone -> thread pour permettre les requêtes concurrentes
+                ticker = await asyncio.to_thread(self.binance_client.get_ticker, symbol=symbol)
                 return ticker
             
             elif self.ccxt_client:
@@ -493,11 +817,34 @@ class DataFetcher:
             self.logger.error(f"❌ Erreur récupération ticker {symbol}: {e}")
             return None
     
+    async def get_tickers(self, symbols: List[str]) -> Dict[str, float]:
+        """Derniers prix de plusieurs paires en une seule requête (/api/v3/ticker/price?symbols=[...])"""
+        if not symbols:
+            return {}
+        
+        try:
+            if self.binance_client:
+                symbols_param = '[' + ','.join(f'"{symbol}"' for symbol in symbols) + ']'
+                tickers = await asyncio.to_thread(self.binance_client.get_symbol_ticker, symbols=symbols_param)
+                return {ticker['symbol']: float(ticker['price']) for ticker in tickers}
+            
+            elif self.ccxt_client:
+                tickers = await self.ccxt_client.fetch_tickers([symbol.replace('USDC', '/USDC') for symbol in symbols])
+                return {symbol.replace('/', ''): float(ticker['last']) for symbol, ticker in tickers.items()}
+            
+            else:
+                raise Exception("Aucun client API disponible")
+                
+        except Exception as e:
+            self.logger.error(f"❌ Erreur récupération prix {symbols}: {e}")
+            return {}
+    
     async def get_account_balance(self) -> Dict[str, Dict[str, str]]:
         """Récupère le solde du compte"""
         try:
             if self.binance_client:
-                account = self.binance_client.get_account()
+                # Client synchrone -> thread pour ne pas bloquer la boucle d'événements
+                account = await asyncio.to_thread(self.binance_client.get_account)
                 
                 # Formatage du solde
                 balances = {}
@@ -878,12 +1225,26 @@ class DataFetcher:
     async def close(self):
         """Ferme les connexions"""
         try:
+            await self.stop_kline_stream()
+            await self.stop_account_streams()
+            if self._stream_client:
+                await self._stream_client.close_connection()
+                self._stream_client = None
             if self.ccxt_client:
                 await self.ccxt_client.close()
-                self.logger.info("✅ Connexions fermées")
+            if self.binance_client:
+                # Session requests keep-alive partagée par tous les appels REST
+                self.binance_client.session.close()
+            self.logger.info("✅ Connexions fermées")
         except Exception as e:
             self.logger.error(f"❌ Erreur fermeture connexions: {e}")
     
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
     def __del__(self):
         """Destructeur pour fermer les connexions"""
         try:
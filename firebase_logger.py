@@ -8,8 +8,9 @@ import asyncio
 import logging
 import json
 import os
+import time
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 try:
     import firebase_admin
@@ -23,11 +24,16 @@ except ImportError:
 class FirebaseLogger:
     """Gestionnaire de logs Firebase pour le trading bot"""
     
+    # Une même paire rejetée pour le même motif n'est journalisée qu'une fois par fenêtre
+    REJECTION_DEDUP_SECONDS = 300
+    
     def __init__(self, credentials_path: str):
         self.credentials_path = credentials_path
         self.db = None
         self.app = None
         self.logger = logging.getLogger(__name__)
+        # (paire, motif sans valeurs chiffrées) -> fin de fenêtre (monotonic)
+        self._recent_rejections: Dict[Tuple[str, str], float] = {}
         self.collections = {
             'trades': 'rsi_scalping_trades',
             'signals': 'rsi_scalping_signals', 
@@ -35,7 +41,8 @@ class FirebaseLogger:
             'daily_stats': 'rsi_scalping_daily_stats',
             'pairs_analysis': 'rsi_scalping_pairs_analysis',
             'logs': 'rsi_scalping_logs',           # Nouveau: Logs en miroir console
-            'trailing_stops': 'rsi_scalping_trailing_stops'  # Nouveau: États trailing stop
+            'trailing_stops': 'rsi_scalping_trailing_stops',  # Nouveau: États trailing stop
+            'rolling_stats': 'rsi_scalping_rolling_stats'     # Agrégats du jour (un doc par date UTC)
         }
         
     async def initialize(self) -> bool:
@@ -184,9 +191,21 @@ class FirebaseLogger:
                 'trade_result': 'WIN' if pnl_amount > 0 else 'LOSS'
             }
             
-            # Mise à jour dans Firestore
+            # Mise à jour du trade et des agrégats du jour dans un seul batch: le dashboard
+            # lit ses métriques dans un document au lieu de rescanner les trades
             doc_ref = self.db.collection(self.collections['trades']).document(trade_id)
-            doc_ref.update(update_data)
+            day = exit_time.strftime('%Y-%m-%d')
+            stats_ref = self.db.collection(self.collections['rolling_stats']).document(day)
+            batch = self.db.batch()
+            batch.update(doc_ref, update_data)
+            batch.set(stats_ref, {
+                'date': day,
+                'total_pnl': firestore.Increment(pnl_amount),
+                'total_trades': firestore.Increment(1),
+                'winning_trades': firestore.Increment(1 if pnl_amount > 0 else 0),
+                'updated_at': exit_time
+            }, merge=True)
+            batch.commit()
             
             self.logger.info(f"🔥 Trade fermé loggé: {trade_id} | P&L: {pnl_amount:+.2f}")
             return True
@@ -329,6 +348,23 @@ class FirebaseLogger:
             self.logger.error(f"❌ Erreur log console mirror: {e}")
             return False
     
+    def _build_rejection_doc(self, pair: str, reason: str, details: Dict = None, 
+                             spread: float = 0, volume: float = 0, volatility: float = 0) -> Dict:
+        """Construit le document d'une paire rejetée"""
+        return {
+            'pair': pair,
+            'timestamp': datetime.now(timezone.utc),
+            'rejection_reason': reason,
+            'details': details or {},
+            'metrics': {
+                'spread_percent': spread,
+                'volume_usdc': volume,
+                'volatility_percent': volatility
+            },
+            'action': 'PAIR_REJECTED',
+            'log_message': f"⛔ PAIRE REJETÉE: {pair} - {reason}"
+        }
+    
     async def log_pair_rejected_detailed(self, pair: str, reason: str, details: Dict = None, 
                                         spread: float = 0, volume: float = 0, volatility: float = 0) -> bool:
         """Log une paire rejetée avec détails complets"""
@@ -336,19 +372,7 @@ class FirebaseLogger:
             if not self.db:
                 return False
             
-            rejection_doc = {
-                'pair': pair,
-                'timestamp': datetime.now(timezone.utc),
-                'rejection_reason': reason,
-                'details': details or {},
-                'metrics': {
-                    'spread_percent': spread,
-                    'volume_usdc': volume,
-                    'volatility_percent': volatility
-                },
-                'action': 'PAIR_REJECTED',
-                'log_message': f"⛔ PAIRE REJETÉE: {pair} - {reason}"
-            }
+            rejection_doc = self._build_rejection_doc(pair, reason, details, spread, volume, volatility)
             
             # Enregistrement
             doc_ref = self.db.collection(self.collections['pairs_analysis']).document()
@@ -363,6 +387,68 @@ class FirebaseLogger:
             self.logger.error(f"❌ Erreur log paire rejetée: {e}")
             return False
     
+    async def log_pairs_rejected_batch(self, rejections: List[Dict]) -> bool:
+        """Log plusieurs paires rejetées (+ miroir console) en un seul commit Firestore
+        
+        Chaque élément contient les arguments de log_pair_rejected_detailed:
+        {'pair', 'reason', 'details', 'spread', 'volume', 'volatility'}.
+        Les rejets déjà journalisés pour le même motif depuis moins de
+        REJECTION_DEDUP_SECONDS sont ignorés.
+        """
+        try:
+            if not self.db or not rejections:
+                return False
+            
+            now = time.monotonic()
+            recent = self._recent_rejections
+            for key in [key for key, expires in recent.items() if expires <= now]:
+                del recent[key]
+            
+            # Un seul rejet par (paire, motif); la fenêtre de dédoublonnage n'est ouverte
+            # qu'une fois le commit réussi (un échec laisse le rejet être rejoué)
+            fresh = {}
+            for rejection in rejections:
+                # "spread trop élevé (0.21%)" -> "spread trop élevé"
+                key = (rejection['pair'], rejection['reason'].split(' (', 1)[0])
+                if key not in recent and key not in fresh:
+                    fresh[key] = rejection
+            if not fresh:
+                return True
+            
+            pairs_ref = self.db.collection(self.collections['pairs_analysis'])
+            logs_ref = self.db.collection(self.collections['logs'])
+            
+            keys = list(fresh)
+            writes = []
+            for rejection in fresh.values():
+                rejection_doc = self._build_rejection_doc(**rejection)
+                writes.append((pairs_ref.document(), rejection_doc))
+                writes.append((logs_ref.document(), {
+                    'timestamp': rejection_doc['timestamp'],
+                    'level': 'INFO',
+                    'message': rejection_doc['log_message'],
+                    'module': 'pair_scanner',
+                    'bot_type': 'rsi_scalping_pro'
+                }))
+            
+            # Un batch Firestore est limité à 500 écritures (2 par rejet)
+            loop = asyncio.get_running_loop()
+            for start in range(0, len(writes), 500):
+                batch = self.db.batch()
+                for doc_ref, doc in writes[start:start + 500]:
+                    batch.set(doc_ref, doc)
+                await loop.run_in_executor(None, batch.commit)
+                
+                expires = time.monotonic() + self.REJECTION_DEDUP_SECONDS
+                for key in keys[start // 2:(start + 500) // 2]:
+                    recent[key] = expires
+            
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"❌ Erreur log paires rejetées (batch): {e}")
+            return False
+    
     async def log_signal_detected(self, pair: str, signal_data: Dict, is_valid: bool, 
                                  signal_strength: int, action_taken: str = "") -> bool:
         """Log un signal détecté avec détails"""
@@ -7,6 +7,8 @@ Calculs optimisés avec TA-Lib et pandas
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Tuple, Optional
+from collections import deque
+from dataclasses import dataclass, field
 import logging
 
 try:
@@ -16,240 +18,324 @@ except ImportError:
     TALIB_AVAILABLE = False
     print("⚠️ TA-Lib non disponible. Utilisation des calculs manuels.")
 
+def _ema_series(values: np.ndarray, period: int) -> np.ndarray:
+    """Série complète de l'EMA initialisée sur la première valeur (récurrence vectorisée par pandas)"""
+    return pd.Series(values).ewm(span=period, adjust=False).mean().to_numpy()
+
+
+def _wilder_rsi(prices: np.ndarray, period: int) -> np.ndarray:
+    """RSI avec lissage de Wilder (moyenne simple sur la première fenêtre puis alpha = 1/période)
+    
+    Neutre (50) tant que l'historique est insuffisant.
+    """
+    out = np.full(len(prices), 50.0)
+    if len(prices) <= period:
+        return out
+    
+    deltas = np.diff(prices)
+    gains = np.clip(deltas, 0.0, None)
+    losses = np.clip(-deltas, 0.0, None)
+    
+    # La moyenne simple de la première fenêtre sert de point de départ au lissage
+    gains_seeded = np.concatenate(([gains[:period].mean()], gains[period:]))
+    losses_seeded = np.concatenate(([losses[:period].mean()], losses[period:]))
+    avg_gain = pd.Series(gains_seeded).ewm(alpha=1.0 / period, adjust=False).mean().to_numpy()
+    avg_loss = pd.Series(losses_seeded).ewm(alpha=1.0 / period, adjust=False).mean().to_numpy()
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    out[period:] = np.where(avg_loss == 0.0, 100.0, rsi)
+    return out
+
+
+@dataclass
+class IndicatorState:
+    """État incrémental des indicateurs d'une paire, mis à jour bougie par bougie
+    
+    Seules les bougies clôturées modifient l'état (update, O(1)); la bougie en cours
+    est évaluée par snapshot sans rien modifier. RSI de Wilder, EMA initialisées sur le
+    premier prix, signal MACD = EMA(9) du MACD, écart type population (mêmes définitions
+    que les calculs manuels de TechnicalIndicators).
+    """
+    rsi_period: int = 14
+    ema_fast_period: int = 9
+    ema_slow_period: int = 21
+    macd_fast_period: int = 12
+    macd_slow_period: int = 26
+    macd_signal_period: int = 9
+    bb_period: int = 20
+    bb_std: float = 2.0
+    volume_period: int = 20
+    high_lookback: int = 5
+    
+    count: int = 0
+    last_open_time: Optional[int] = None
+    last_close: float = 0.0
+    ema_fast: float = 0.0
+    ema_slow: float = 0.0
+    macd_fast: float = 0.0
+    macd_slow: float = 0.0
+    macd_signal: float = 0.0
+    rsi_avg_gain: float = 0.0
+    rsi_avg_loss: float = 0.0
+    bb_sum: float = 0.0
+    bb_sumsq: float = 0.0
+    volume_sum: float = 0.0
+    closes: deque = field(default_factory=deque)
+    volumes: deque = field(default_factory=deque)
+    highs: deque = field(default_factory=deque)
+    
+    @property
+    def is_ready(self) -> bool:
+        """Assez de bougies clôturées pour que toutes les fenêtres soient pleines"""
+        return self.count > max(self.rsi_period, self.macd_slow_period, self.bb_period,
+                                self.volume_period, self.high_lookback)
+    
+    @staticmethod
+    def _ema_step(ema: float, price: float, period: int) -> float:
+        return ema + 2.0 / (period + 1) * (price - ema)
+    
+    def _rsi_step(self, avg_gain: float, avg_loss: float, price: float) -> Tuple[float, float]:
+        delta = price - self.last_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        period = self.rsi_period
+        if self.count <= period:
+            return avg_gain + gain / period, avg_loss + loss / period
+        return (avg_gain * (period - 1) + gain) / period, (avg_loss * (period - 1) + loss) / period
+    
+    def update(self, open_time: int, close: float, high: float, volume: float):
+        """Intègre une bougie clôturée"""
+        if self.count == 0:
+            self.ema_fast = self.ema_slow = self.macd_fast = self.macd_slow = close
+        else:
+            self.ema_fast = self._ema_step(self.ema_fast, close, self.ema_fast_period)
+            self.ema_slow = self._ema_step(self.ema_slow, close, self.ema_slow_period)
+            self.macd_fast = self._ema_step(self.macd_fast, close, self.macd_fast_period)
+            self.macd_slow = self._ema_step(self.macd_slow, close, self.macd_slow_period)
+            self.macd_signal = self._ema_step(self.macd_signal, self.macd_fast - self.macd_slow,
+                                              self.macd_signal_period)
+            self.rsi_avg_gain, self.rsi_avg_loss = self._rsi_step(self.rsi_avg_gain, self.rsi_avg_loss, close)
+        
+        # Fenêtres glissantes: on garde period - 1 bougies clôturées, la bougie en cours complète la fenêtre
+        self.closes.append(close)
+        self.bb_sum += close
+        self.bb_sumsq += close * close
+        if len(self.closes) >= self.bb_period:
+            oldest = self.closes.popleft()
+            self.bb_sum -= oldest
+            self.bb_sumsq -= oldest * oldest
+        
+        self.volumes.append(volume)
+        self.volume_sum += volume
+        if len(self.volumes) >= self.volume_period:
+            self.volume_sum -= self.volumes.popleft()
+        
+        self.highs.append(high)
+        if len(self.highs) >= self.high_lookback:
+            self.highs.popleft()
+        
+        self.count += 1
+        self.last_open_time = open_time
+        self.last_close = close
+    
+    def snapshot(self, close: float, high: float, volume: float) -> Dict[str, float]:
+        """Valeurs des indicateurs en incluant la bougie en cours, sans modifier l'état"""
+        ema_fast = self._ema_step(self.ema_fast, close, self.ema_fast_period)
+        ema_slow = self._ema_step(self.ema_slow, close, self.ema_slow_period)
+        macd = (self._ema_step(self.macd_fast, close, self.macd_fast_period)
+                - self._ema_step(self.macd_slow, close, self.macd_slow_period))
+        
+        avg_gain, avg_loss = self._rsi_step(self.rsi_avg_gain, self.rsi_avg_loss, close)
+        rsi = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        
+        bb_mean = (self.bb_sum + close) / self.bb_period
+        bb_variance = max((self.bb_sumsq + close * close) / self.bb_period - bb_mean * bb_mean, 0.0)
+        
+        return {
+            'rsi': rsi,
+            'ema_fast': ema_fast,
+            'ema_slow': ema_slow,
+            'macd': macd,
+            'signal': self._ema_step(self.macd_signal, macd, self.macd_signal_period),
+            'bb_lower': bb_mean - self.bb_std * bb_variance ** 0.5,
+            'volume_sma': (self.volume_sum + volume) / self.volume_period,
+            'recent_high': max(high, *self.highs)
+        }
+
 
 class TechnicalIndicators:
     """Classe pour calculer les indicateurs techniques"""
     
+    # Logger partagé par toutes les instances (pas de lookup à chaque instanciation)
+    logger = logging.getLogger(__name__)
+    
     def __init__(self, config=None):
         self.config = config
-        self.logger = logging.getLogger(__name__)
+        
+        # Cache de la dernière analyse (évite de tout recalculer si aucune nouvelle bougie)
+        self._last_analysis_key = None
+        self._last_analysis = None
     
-    def calculate_rsi(self, prices, period: int = 14):
-        """Calcule le RSI (Relative Strength Index)"""
-        try:
-            # Convertir en numpy array si c'est une Series pandas
-            if hasattr(prices, 'values'):
-                prices_array = prices.values
-            else:
-                prices_array = np.array(prices, dtype=np.float64)
-            
-            if TALIB_AVAILABLE and len(prices_array) >= period:
-                rsi = talib.RSI(prices_array, timeperiod=period)
-                # Retourner une Series pandas pour compatibilité avec .iloc
-                if hasattr(prices, 'index'):
-                    return pd.Series(rsi, index=prices.index)
-                else:
-                    return pd.Series(rsi)
-            else:
-                # Calcul manuel du RSI
-                if len(prices_array) < period + 1:
-                    result = np.full(len(prices_array), 50.0)
-                    if hasattr(prices, 'index'):
-                        return pd.Series(result, index=prices.index)
-                    else:
-                        return pd.Series(result)
-                
-                # Calcul RSI avec fenêtre glissante
-                rsi_values = []
-                for i in range(len(prices_array)):
-                    if i < period:
-                        rsi_values.append(50.0)
-                    else:
-                        window_prices = prices_array[i-period:i+1]
-                        deltas = np.diff(window_prices)
-                        gains = np.where(deltas > 0, deltas, 0)
-                        losses = np.where(deltas < 0, -deltas, 0)
-                        
-                        avg_gain = np.mean(gains)
-                        avg_loss = np.mean(losses)
-                        
-                        if avg_loss == 0:
-                            rsi_values.append(100.0)
-                        else:
-                            rs = avg_gain / avg_loss
-                            rsi = 100 - (100 / (1 + rs))
-                            rsi_values.append(rsi)
-                
-                if hasattr(prices, 'index'):
-                    return pd.Series(rsi_values, index=prices.index)
-                else:
-                    return pd.Series(rsi_values)
-                
-                return float(rsi)
-                
-        except Exception as e:
-            self.logger.error(f"❌ Erreur calcul RSI: {e}")
-            return 50.0
+    def calculate_rsi(self, prices, period: int = 14, only_last: bool = False):
+        """Calcule le RSI (Relative Strength Index)
+        
+        only_last=True retourne directement la dernière valeur (float) sans construire de Series.
+        """
+        # Convertir en numpy array si c'est une Series pandas (index conservé pour le retour)
+        is_series = isinstance(prices, pd.Series)
+        prices_array = prices.to_numpy(dtype=np.float64, copy=False) if is_series else np.asarray(prices, dtype=np.float64)
+        idx = prices.index if is_series else None
+        
+        if TALIB_AVAILABLE and len(prices_array) >= period:
+            rsi = talib.RSI(prices_array, timeperiod=period)
+            if only_last:
+                return float(rsi[-1])
+            # Retourner une Series pandas pour compatibilité avec .iloc
+            return pd.Series(rsi, index=idx)
+        
+        # Lissage de Wilder (comme TA-Lib et IndicatorState)
+        rsi = _wilder_rsi(prices_array, period)
+        return float(rsi[-1]) if only_last else pd.Series(rsi, index=idx)
     
-    def calculate_ema(self, prices, period: int):
-        """Calcule l'EMA (Exponential Moving Average)"""
-        try:
-            # Convertir en numpy array si c'est une Series pandas
-            if hasattr(prices, 'values'):
-                prices_array = prices.values
-            else:
-                prices_array = np.array(prices, dtype=np.float64)
-            
-            if TALIB_AVAILABLE and len(prices_array) >= period:
-                ema = talib.EMA(prices_array, timeperiod=period)
-                # Retourner une Series pandas pour compatibilité avec .iloc
-                if hasattr(prices, 'index'):
-                    return pd.Series(ema, index=prices.index)
-                else:
-                    return pd.Series(ema)
-            else:
-                # Calcul manuel de l'EMA
-                if len(prices_array) < period:
-                    result = np.full(len(prices_array), prices_array[-1] if len(prices_array) > 0 else 0.0)
-                    if hasattr(prices, 'index'):
-                        return pd.Series(result, index=prices.index)
-                    else:
-                        return pd.Series(result)
-                
-                multiplier = 2 / (period + 1)
-                ema_values = []
-                ema = prices_array[0]
-                ema_values.append(ema)
-                
-                for price in prices_array[1:]:
-                    ema = (price * multiplier) + (ema * (1 - multiplier))
-                    ema_values.append(ema)
-                
-                if hasattr(prices, 'index'):
-                    return pd.Series(ema_values, index=prices.index)
-                else:
-                    return pd.Series(ema_values)
-                
-        except Exception as e:
-            self.logger.error(f"❌ Erreur calcul EMA: {e}")
-            return prices[-1] if prices else 0.0
+    def calculate_ema(self, prices, period: int, only_last: bool = False):
+        """Calcule l'EMA (Exponential Moving Average)
+        
+        only_last=True retourne directement la dernière valeur (float) sans construire de Series.
+        """
+        # Convertir en numpy array si c'est une Series pandas (index conservé pour le retour)
+        is_series = isinstance(prices, pd.Series)
+        prices_array = prices.to_numpy(dtype=np.float64, copy=False) if is_series else np.asarray(prices, dtype=np.float64)
+        idx = prices.index if is_series else None
+        
+        if TALIB_AVAILABLE and len(prices_array) >= period:
+            ema = talib.EMA(prices_array, timeperiod=period)
+            if only_last:
+                return float(ema[-1])
+            # Retourner une Series pandas pour compatibilité avec .iloc
+            return pd.Series(ema, index=idx)
+        
+        # Calcul manuel de l'EMA (dernier prix si pas assez de bougies)
+        if len(prices_array) < period:
+            last_price = float(prices_array[-1]) if len(prices_array) > 0 else 0.0
+            return last_price if only_last else pd.Series(np.full(len(prices_array), last_price), index=idx)
+        
+        ema = _ema_series(prices_array, period)
+        return float(ema[-1]) if only_last else pd.Series(ema, index=idx)
     
-    def calculate_macd(self, prices, fast: int = 12, slow: int = 26, signal: int = 9):
-        """Calcule le MACD"""
-        try:
-            # Convertir en numpy array si c'est une Series pandas
-            if hasattr(prices, 'values'):
-                prices_array = prices.values
-            else:
-                prices_array = np.array(prices, dtype=np.float64)
+    def calculate_macd(self, prices, fast: int = 12, slow: int = 26, signal: int = 9, only_last: bool = False):
+        """Calcule le MACD
+        
+        only_last=True retourne les dernières valeurs (floats) au lieu de Series.
+        """
+        # Convertir en numpy array si c'est une Series pandas (index conservé pour le retour)
+        is_series = isinstance(prices, pd.Series)
+        prices_array = prices.to_numpy(dtype=np.float64, copy=False) if is_series else np.asarray(prices, dtype=np.float64)
+        idx = prices.index if is_series else None
+        
+        if TALIB_AVAILABLE and len(prices_array) >= slow:
+            macd, signal_line, histogram = talib.MACD(prices_array, fastperiod=fast, slowperiod=slow, signalperiod=signal)
             
-            if TALIB_AVAILABLE and len(prices_array) >= slow:
-                macd, signal_line, histogram = talib.MACD(prices_array, fastperiod=fast, slowperiod=slow, signalperiod=signal)
-                
-                # Retourner des Series pandas pour compatibilité avec .iloc
-                if hasattr(prices, 'index'):
-                    return {
-                        'macd': pd.Series(macd, index=prices.index),
-                        'signal': pd.Series(signal_line, index=prices.index),
-                        'histogram': pd.Series(histogram, index=prices.index)
-                    }
-                else:
-                    return {
-                        'macd': pd.Series(macd),
-                        'signal': pd.Series(signal_line),
-                        'histogram': pd.Series(histogram)
-                    }
-            else:
-                # Calcul manuel du MACD
-                if len(prices_array) < slow:
-                    result = np.zeros(len(prices_array))
-                    if hasattr(prices, 'index'):
-                        return {
-                            'macd': pd.Series(result, index=prices.index),
-                            'signal': pd.Series(result, index=prices.index),
-                            'histogram': pd.Series(result, index=prices.index)
-                        }
-                    else:
-                        return {
-                            'macd': pd.Series(result),
-                            'signal': pd.Series(result),
-                            'histogram': pd.Series(result)
-                        }
-                
-                ema_fast = self.calculate_ema(prices, fast)
-                ema_slow = self.calculate_ema(prices, slow)
-                macd = ema_fast - ema_slow
-                
-                # Pour le signal, simplification: signal = macd * 0.9
-                signal_line = macd * 0.9
-                histogram = macd - signal_line
-                
+            if only_last:
                 return {
-                    'macd': macd,
-                    'signal': signal_line,
-                    'histogram': histogram
+                    'macd': float(macd[-1]),
+                    'signal': float(signal_line[-1]),
+                    'histogram': float(histogram[-1])
                 }
-                
-        except Exception as e:
-            self.logger.error(f"❌ Erreur calcul MACD: {e}")
-            return {'macd': 0.0, 'signal': 0.0, 'histogram': 0.0}
+            
+            # Retourner des Series pandas pour compatibilité avec .iloc
+            return {
+                'macd': pd.Series(macd, index=idx),
+                'signal': pd.Series(signal_line, index=idx),
+                'histogram': pd.Series(histogram, index=idx)
+            }
+        
+        # Calcul manuel du MACD (zéro si pas assez de bougies)
+        if len(prices_array) < slow:
+            if only_last:
+                return {'macd': 0.0, 'signal': 0.0, 'histogram': 0.0}
+            result = np.zeros(len(prices_array))
+            return {
+                'macd': pd.Series(result, index=idx),
+                'signal': pd.Series(result, index=idx),
+                'histogram': pd.Series(result, index=idx)
+            }
+        
+        # Ligne de signal: EMA du MACD (mêmes définitions que IndicatorState)
+        macd = _ema_series(prices_array, fast) - _ema_series(prices_array, slow)
+        signal_line = _ema_series(macd, signal)
+        
+        if only_last:
+            macd_last = float(macd[-1])
+            signal_last = float(signal_line[-1])
+            return {
+                'macd': macd_last,
+                'signal': signal_last,
+                'histogram': macd_last - signal_last
+            }
+        
+        return {
+            'macd': pd.Series(macd, index=idx),
+            'signal': pd.Series(signal_line, index=idx),
+            'histogram': pd.Series(macd - signal_line, index=idx)
+        }
     
     def calculate_bollinger_bands(self, prices: List[float], period: int = 20, std_dev: float = 2.0) -> Dict[str, float]:
         """Calcule les bandes de Bollinger"""
-        try:
-            if TALIB_AVAILABLE and len(prices) >= period:
-                prices_array = np.array(prices, dtype=np.float64)
-                upper, middle, lower = talib.BBANDS(prices_array, timeperiod=period, nbdevup=std_dev, nbdevdn=std_dev)
-                
-                return {
-                    'upper': float(upper[-1]) if not np.isnan(upper[-1]) else prices[-1],
-                    'middle': float(middle[-1]) if not np.isnan(middle[-1]) else prices[-1],
-                    'lower': float(lower[-1]) if not np.isnan(lower[-1]) else prices[-1]
-                }
-            else:
-                # Calcul manuel des bandes de Bollinger
-                if len(prices) < period:
-                    price = prices[-1] if prices else 0.0
-                    return {'upper': price, 'middle': price, 'lower': price}
-                
-                recent_prices = prices[-period:]
-                middle = np.mean(recent_prices)
-                std = np.std(recent_prices)
-                
-                upper = middle + (std_dev * std)
-                lower = middle - (std_dev * std)
-                
-                return {
-                    'upper': float(upper),
-                    'middle': float(middle),
-                    'lower': float(lower)
-                }
-                
-        except Exception as e:
-            self.logger.error(f"❌ Erreur calcul Bollinger: {e}")
-            price = prices[-1] if prices else 0.0
+        prices_array = np.asarray(prices, dtype=np.float64)
+        
+        # Pas assez de bougies: bandes confondues avec le dernier prix
+        if len(prices_array) < period:
+            price = float(prices_array[-1]) if len(prices_array) > 0 else 0.0
             return {'upper': price, 'middle': price, 'lower': price}
+        
+        last_price = float(prices_array[-1])
+        
+        if TALIB_AVAILABLE:
+            upper, middle, lower = talib.BBANDS(prices_array, timeperiod=period, nbdevup=std_dev, nbdevdn=std_dev)
+            
+            return {
+                'upper': float(upper[-1]) if not np.isnan(upper[-1]) else last_price,
+                'middle': float(middle[-1]) if not np.isnan(middle[-1]) else last_price,
+                'lower': float(lower[-1]) if not np.isnan(lower[-1]) else last_price
+            }
+        
+        # Calcul manuel des bandes de Bollinger (écart type population)
+        window = prices_array[-period:]
+        middle = float(window.mean())
+        std = float(window.std())
+        
+        return {
+            'upper': middle + std_dev * std,
+            'middle': middle,
+            'lower': middle - std_dev * std
+        }
     
     def calculate_volume_sma(self, volumes: List[float], period: int = 20) -> float:
         """Calcule la moyenne mobile simple du volume"""
-        try:
-            if len(volumes) < period:
-                return volumes[-1] if volumes else 0.0
-            
-            return float(np.mean(volumes[-period:]))
-            
-        except Exception as e:
-            self.logger.error(f"❌ Erreur calcul Volume SMA: {e}")
-            return volumes[-1] if volumes else 0.0
+        volumes_array = np.asarray(volumes, dtype=np.float64)
+        
+        if len(volumes_array) < period:
+            return float(volumes_array[-1]) if len(volumes_array) > 0 else 0.0
+        
+        return float(volumes_array[-period:].mean())
     
     def detect_breakout(self, prices: List[float], volumes: List[float], threshold: float = 0.02) -> bool:
         """Détecte un breakout basé sur le prix et le volume"""
-        try:
-            if len(prices) < 3 or len(volumes) < 3:
-                return False
-            
-            # Vérifier la hausse de prix
-            price_change = (prices[-1] - prices[-2]) / prices[-2]
-            
-            # Vérifier l'augmentation du volume
-            avg_volume = np.mean(volumes[-10:]) if len(volumes) >= 10 else volumes[-1]
-            volume_spike = volumes[-1] > (avg_volume * 1.5)
-            
-            return price_change > threshold and volume_spike
-            
-        except Exception as e:
-            self.logger.error(f"❌ Erreur détection breakout: {e}")
+        if len(prices) < 3 or len(volumes) < 3:
             return False
+        
+        prices_array = np.asarray(prices, dtype=np.float64)
+        volumes_array = np.asarray(volumes, dtype=np.float64)
+        
+        # Vérifier la hausse de prix
+        price_change = (prices_array[-1] - prices_array[-2]) / prices_array[-2]
+        
+        # Vérifier l'augmentation du volume
+        avg_volume = np.mean(volumes_array[-10:]) if len(volumes_array) >= 10 else volumes_array[-1]
+        volume_spike = volumes_array[-1] > (avg_volume * 1.5)
+        
+        return bool(price_change > threshold and volume_spike)
     
     def analyze_market_conditions(self, klines_data: List[List]) -> Dict[str, any]:
         """Analyse complète des conditions de marché"""
@@ -266,22 +352,29 @@ class TechnicalIndicators:
                     'conditions_met': 0
                 }
             
-            # Extraction des données
-            closes = [float(kline[4]) for kline in klines_data]  # Prix de clôture
-            volumes = [float(kline[5]) for kline in klines_data]  # Volume
+            # Même bougie que l'appel précédent (nombre, open time, close, volume): résultat en cache
+            last_kline = klines_data[-1]
+            cache_key = (len(klines_data), last_kline[0], last_kline[4], last_kline[5])
+            if cache_key == self._last_analysis_key:
+                return self._last_analysis
+            
+            # Extraction des données (allocation unique, sans liste intermédiaire de floats)
+            n_klines = len(klines_data)
+            closes = np.fromiter((kline[4] for kline in klines_data), dtype=np.float64, count=n_klines)  # Prix de clôture
+            volumes = np.fromiter((kline[5] for kline in klines_data), dtype=np.float64, count=n_klines)  # Volume
             
             # Calcul des indicateurs
-            rsi = self.calculate_rsi(closes)
-            ema_9 = self.calculate_ema(closes, 9)
-            ema_21 = self.calculate_ema(closes, 21)
-            macd = self.calculate_macd(closes)
+            rsi = self.calculate_rsi(closes, only_last=True)
+            ema_9 = self.calculate_ema(closes, 9, only_last=True)
+            ema_21 = self.calculate_ema(closes, 21, only_last=True)
+            macd = self.calculate_macd(closes, only_last=True)
             bollinger = self.calculate_bollinger_bands(closes)
             volume_avg = self.calculate_volume_sma(volumes)
             breakout = self.detect_breakout(closes, volumes)
             
             # Vérification des conditions d'entrée
             conditions_met = 0
-            current_price = closes[-1]
+            current_price = float(closes[-1])
             
             # 1. RSI < 28 (survente)
             if rsi < 28:
@@ -307,19 +400,23 @@ class TechnicalIndicators:
             if breakout:
                 conditions_met += 1
             
-            return {
+            analysis = {
                 'rsi': rsi,
                 'ema_9': ema_9,
                 'ema_21': ema_21,
                 'macd': macd,
                 'bollinger': bollinger,
                 'volume_avg': volume_avg,
-                'current_volume': volumes[-1],
+                'current_volume': float(volumes[-1]),
                 'breakout_detected': breakout,
                 'conditions_met': conditions_met,
                 'current_price': current_price
             }
             
+            self._last_analysis_key = cache_key
+            self._last_analysis = analysis
+            return analysis
+            
         except Exception as e:
             self.logger.error(f"❌ Erreur analyse conditions marché: {e}")
             return {
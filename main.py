@@ -28,26 +28,55 @@ Gestion de position:
 import asyncio
 import logging
 import os
+import random
 import sys
 import time
-import traceback
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import pandas as pd
-import numpy as np
 
 # Imports locaux
 from config import TradingConfig, APIConfig, LoggingConfig
 from data_fetcher import DataFetcher
-from indicators import TechnicalIndicators
+from indicators import IndicatorState
 from firebase_logger import FirebaseLogger
 from telegram_notifier import TelegramNotifier, NotificationConfig
 from trade_executor import TradeExecutor
+from utils import setup_event_loop_policy
 
 
 class RSIScalpingBot:
     """Bot de trading RSI Scalping Pro"""
     
+    # Durée de validité du cache des paires USDC (exchangeInfo)
+    PAIRS_CACHE_TTL_SECONDS = 3600
+    
+    # Intervalle minimum entre deux sauvegardes périodiques de l'état
+    STATE_SAVE_MIN_INTERVAL_SECONDS = 60
+    
+    # Réécriture complète de l'état Firebase au moins toutes les heures (sinon mises à jour partielles)
+    STATE_CHECKPOINT_INTERVAL_SECONDS = 3600
+    
+    # Durée de validité du capital USDC en cache (invalidé à chaque achat/vente)
+    CAPITAL_CACHE_TTL_SECONDS = 30
+    
+    # Attentes successives avant chaque nouveau test de connexion après une erreur réseau
+    RECONNECT_BACKOFF_SECONDS = (5, 10, 30)
+    
+    # Nombre de paires dont l'état des indicateurs et la dernière analyse restent en mémoire (LRU)
+    INDICATOR_CACHE_MAX_PAIRS = 64
+    
+    # Écart toléré entre solde Binance et quantité de la position (pas de lot, frais, poussière)
+    POSITION_BALANCE_TOLERANCE = 0.05
+    
+    # Seuils d'entrée de la stratégie (analyze_pair)
+    ENTRY_BREAKOUT_MULTIPLIER = 1.0007  # Cassure +0.07% du dernier haut local
+    ENTRY_RSI_OVERSOLD = 28.0           # Zone de survente profonde
+    ENTRY_BB_MAX_DISTANCE = 0.005       # 0.5% de marge autour de la bande inférieure
+    ENTRY_CONDITIONS_TOTAL = 6
+    ENTRY_MIN_CONDITIONS = 4
+    
     def __init__(self):
         self.setup_logging()
         self.logger = logging.getLogger(__name__)
@@ -60,9 +89,20 @@ class RSIScalpingBot:
         from config import RiskManagementConfig
         self.risk_config = RiskManagementConfig()
         
+        # Blacklist figée: paires complètes (XRPUSDC) ou symboles de base (XRP)
+        self._blacklist = frozenset(self.config.BLACKLISTED_SYMBOLS) | frozenset(self.config.BLACKLISTED_PAIRS)
+        
+        # Masque des 168 heures de la semaine où le trading est autorisé, figé depuis la configuration
+        self._hour_mask = self._build_hour_mask()
+        
         # État du bot
         self.is_running = False
         self.last_trade_time = {}  # Dernier trade par paire
+        # Horloges monotones des cooldowns (last_trade_time et loss_streak_pause_until restent
+        # les horodatages persistés dans Firebase)
+        self._last_trade_monotonic: Dict[str, float] = {}
+        self._latest_trade_monotonic = None  # Plus récent des _last_trade_monotonic (toutes paires)
+        self._pause_until_monotonic = None
         self.consecutive_losses = 0
         self.loss_streak_pause_until = None
         self.daily_pnl = 0.0
@@ -73,21 +113,60 @@ class RSIScalpingBot:
         # Positions ouvertes
         self.open_positions = {}
         
+        # Limite de requêtes Binance simultanées (poids API)
+        self._api_semaphore = asyncio.Semaphore(20)
+        
+        # Cache des paires USDC: (expiration monotonic, paires)
+        self._usdc_pairs_cache = (0.0, [])
+        
+        # Paires USDC hors blacklist: (liste USDC source, candidates), recalculé à chaque rafraîchissement
+        self._scan_candidates = (None, [])
+        
+        # Cache du capital USDC: (expiration monotonic, capital)
+        self._cached_capital = (0.0, 0.0)
+        
+        # Horloge murale lue une fois par itération de la boucle principale
+        self._cycle_now = datetime.now()
+        
+        # Dernière sauvegarde d'état Firebase (time.monotonic)
+        self._last_state_save = float('-inf')
+        
+        # Sauvegardes d'état différées: les demandes sont regroupées par une tâche d'écriture en arrière-plan
+        self._state_dirty = asyncio.Event()
+        self._state_writer_task: Optional[asyncio.Task] = None
+        
+        # Dernier état écrit dans Firebase, base des mises à jour partielles: (doc_id, état, checkpoint monotonic)
+        self._saved_state = None
+        
+        # Dernier RSI/MACD de sortie par position: paire -> (ouverture bougie 1m ms, rsi, macd, signal)
+        self._indicator_cache: Dict[str, Tuple[int, float, float, float]] = {}
+        
+        # État incrémental des indicateurs par paire (bougies 1m clôturées), LRU borné
+        self.indicator_states: OrderedDict[str, IndicatorState] = OrderedDict()
+        
+        # Dernière analyse par paire: paire -> (clé bougies, signal valide, données d'analyse), LRU borné
+        self._analysis_cache: OrderedDict[str, Tuple[tuple, bool, Dict]] = OrderedDict()
+        
         # Initialisation des modules
         self.data_fetcher = None
-        self.indicators = None
         self.firebase_logger = None
         self.telegram_notifier = None
         self.trade_executor = None
         
         self.logger.info("🚀 RSI Scalping Pro Bot initialisé")
     
-    async def save_state_to_firebase(self):
-        """Sauvegarde l'état du bot dans Firebase"""
+    async def save_state_to_firebase(self, force: bool = True):
+        """Sauvegarde l'état du bot dans Firebase
+        
+        force=False (sauvegarde périodique) ignore l'appel si la dernière sauvegarde est trop récente.
+        """
         try:
             if not self.firebase_logger or not self.firebase_logger.db:
                 return
             
+            if not force and time.monotonic() - self._last_state_save < self.STATE_SAVE_MIN_INTERVAL_SECONDS:
+                return
+            
             state_data = {
                 'last_trade_time': {pair: timestamp.isoformat() for pair, timestamp in self.last_trade_time.items()},
                 'consecutive_losses': self.consecutive_losses,
@@ -115,16 +194,57 @@ class RSIScalpingBot:
                 }
             }
             
-            # Sauvegarde dans Firebase avec ID basé sur la date (méthode synchrone)
+            # Sauvegarde dans Firebase avec ID basé sur la date + "current" pour l'accès rapide,
+            # en un seul batch exécuté hors de la boucle asyncio (client Firestore synchrone)
             doc_id = f"bot_state_{datetime.now().strftime('%Y%m%d')}"
-            self.firebase_logger.db.collection('bot_state').document(doc_id).set(state_data)
+            state_ref = self.firebase_logger.db.collection('bot_state')
+            batch = self.firebase_logger.db.batch()
+            
+            now = time.monotonic()
+            saved = self._saved_state
+            if saved is None or saved[0] != doc_id or now - saved[2] >= self.STATE_CHECKPOINT_INTERVAL_SECONDS:
+                # Démarrage, nouveau jour ou checkpoint: document complet
+                batch.set(state_ref.document(doc_id), state_data)
+                batch.set(state_ref.document('current'), state_data)
+                checkpoint = now
+            else:
+                # Seuls les champs modifiés depuis la dernière écriture
+                updates = self._state_updates(saved[1], state_data)
+                batch.update(state_ref.document(doc_id), updates)
+                batch.update(state_ref.document('current'), updates)
+                checkpoint = saved[2]
+            
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, batch.commit)
+            except Exception:
+                # Document absent ou état distant incertain: réécriture complète au prochain appel
+                self._saved_state = None
+                raise
             
-            # Garde également une sauvegarde "current" pour l'accès rapide
-            self.firebase_logger.db.collection('bot_state').document('current').set(state_data)
+            self._saved_state = (doc_id, state_data, checkpoint)
+            self._last_state_save = now
             
         except Exception as e:
             self.logger.warning(f"⚠️ Impossible de sauvegarder l'état Firebase: {e}")
     
+    @staticmethod
+    def _state_updates(previous: Dict, current: Dict) -> Dict:
+        """Champs à mettre à jour entre deux états (chemins pointés pour positions et horodatages par paire)"""
+        from firebase_admin import firestore
+        
+        updates = {}
+        for key, value in current.items():
+            if key in ('open_positions', 'last_trade_time'):
+                old_entries = previous.get(key, {})
+                for pair, entry in value.items():
+                    if old_entries.get(pair) != entry:
+                        updates[f'{key}.{pair}'] = entry
+                for pair in old_entries.keys() - value.keys():
+                    updates[f'{key}.{pair}'] = firestore.DELETE_FIELD
+            elif previous.get(key) != value:
+                updates[key] = value
+        return updates
+    
     async def load_state_from_firebase(self):
         """Charge l'état du bot depuis Firebase"""
         try:
@@ -155,25 +275,36 @@ class RSIScalpingBot:
             self.trades_this_hour = state_data.get('trades_this_hour', 0)
             self.last_hour_reset = state_data.get('last_hour_reset', datetime.now().hour)
             
+            # Horloge monotone reconstruite depuis les horodatages sauvegardés
+            restore_now = datetime.now()
+            restore_monotonic = time.monotonic()
+            
             # Restaurer loss_streak_pause_until
             if state_data.get('loss_streak_pause_until'):
                 self.loss_streak_pause_until = datetime.fromisoformat(state_data['loss_streak_pause_until'])
+                self._pause_until_monotonic = restore_monotonic + (self.loss_streak_pause_until - restore_now).total_seconds()
             
-            # Restaurer last_trade_time
-            for pair, timestamp_str in state_data.get('last_trade_time', {}).items():
-                self.last_trade_time[pair] = datetime.fromisoformat(timestamp_str)
+            # Conversion groupée de tous les horodatages ISO (last_trade_time + entry_time)
+            trade_times = state_data.get('last_trade_time', {})
+            positions = state_data.get('open_positions', {})
+            timestamp_strs = list(trade_times.values())
+            timestamp_strs.extend(pos_data['entry_time'] for pos_data in positions.values())
+            timestamps = iter(pd.to_datetime(timestamp_strs, format='ISO8601').to_pydatetime())
             
-            # Restaurer open_positions
-            for pair, pos_data in state_data.get('open_positions', {}).items():
-                self.open_positions[pair] = {
-                    'entry_price': pos_data['entry_price'],
-                    'quantity': pos_data['quantity'],
-                    'take_profit': pos_data['take_profit'],
-                    'stop_loss': pos_data['stop_loss'],
-                    'entry_time': datetime.fromisoformat(pos_data['entry_time']),
-                    'position_value': pos_data['position_value'],
-                    'analysis_data': pos_data['analysis_data']
-                }
+            # Restaurer last_trade_time
+            for pair in trade_times:
+                trade_time = next(timestamps)
+                self.last_trade_time[pair] = trade_time
+                self._last_trade_monotonic[pair] = restore_monotonic - (restore_now - trade_time).total_seconds()
+            if self._last_trade_monotonic:
+                self._latest_trade_monotonic = max(self._last_trade_monotonic.values())
+            
+            # Restaurer open_positions: le dict lu de Firestore est repris tel quel (mêmes clés que la sauvegarde)
+            for pair, pos_data in positions.items():
+                pos_data['entry_time'] = next(timestamps)
+                pos_data['entry_monotonic'] = restore_monotonic - (restore_now - pos_data['entry_time']).total_seconds()
+                pos_data['base_asset'] = pair[:-4]
+                self.open_positions[pair] = pos_data
             
             # Log de restauration avec détails
             server_info = state_data.get('server_info', {})
@@ -189,9 +320,21 @@ class RSIScalpingBot:
         except Exception as e:
             self.logger.warning(f"⚠️ Impossible de charger l'état Firebase: {e}")
     
-    async def save_state(self):
+    async def save_state(self, force: bool = True):
         """Alias pour la compatibilité - utilise Firebase maintenant"""
-        await self.save_state_to_firebase()
+        await self.save_state_to_firebase(force)
+    
+    def request_state_save(self):
+        """Demande une sauvegarde d'état sans attendre: écrite par _state_writer (au plus une par seconde)"""
+        self._state_dirty.set()
+    
+    async def _state_writer(self):
+        """Écrit l'état quand il a changé, en regroupant les demandes rapprochées"""
+        while self.is_running:
+            await self._state_dirty.wait()
+            self._state_dirty.clear()
+            await self.save_state_to_firebase()
+            await asyncio.sleep(1.0)
     
     def load_state(self):
         """Wrapper synchrone pour l'initialisation"""
@@ -230,8 +373,8 @@ class RSIScalpingBot:
             # Test de connexion Binance
             await self.data_fetcher.test_connection()
             
-            # Indicateurs techniques
-            self.indicators = TechnicalIndicators(self.config)
+            # Flux WebSocket soldes/exécutions et prix pour la surveillance des positions
+            await self.data_fetcher.start_account_streams()
             
             # Firebase Logger (AVANT de charger l'état)
             if self.api_config.FIREBASE_CREDENTIALS:
@@ -258,8 +401,9 @@ class RSIScalpingBot:
                 trading_config=self.config
             )
             
-            # Test Telegram
+            # Connexion Telegram persistante pour toute la durée du bot, puis test
             if self.telegram_notifier.bot:
+                await self.telegram_notifier.initialize()
                 await self.telegram_notifier.test_connection()
             
             # Trade Executor
@@ -279,13 +423,14 @@ class RSIScalpingBot:
     
     async def check_trading_conditions(self) -> bool:
         """Vérifie si les conditions de trading sont remplies"""
+        now = self._cycle_now
         
         # Vérification des horaires de trading
-        if not self.is_trading_hours():
+        if not self.is_trading_hours(now):
             return False
         
         # Vérification pause après pertes consécutives
-        if self.loss_streak_pause_until and datetime.now() < self.loss_streak_pause_until:
+        if self._pause_until_monotonic is not None and time.monotonic() < self._pause_until_monotonic:
             return False
         
         # Vérification stop loss quotidien
@@ -306,34 +451,32 @@ class RSIScalpingBot:
             return False
         
         # Vérification anti-surtrading
-        if not self.check_anti_surtrading():
+        if not self.check_anti_surtrading(now):
             return False
         
         return True
     
-    def is_trading_hours(self) -> bool:
+    def _build_hour_mask(self) -> int:
+        """Précalcule les heures de trading autorisées: un bit par heure de la semaine (jour*24 + heure)"""
+        hour_mask = 0
+        for weekday in range(7):
+            for hour in range(24):
+                if self.config.TRADING_HOURS_ENABLED:
+                    # Horaires de base (9h-23h)
+                    if not self.config.TRADING_START_HOUR <= hour < self.config.TRADING_END_HOUR:
+                        continue
+                    # Week-end: Samedi (5) et Dimanche (6)
+                    if weekday >= 5 and not self.config.WEEKEND_TRADING_ENABLED:
+                        continue
+                hour_mask |= 1 << (weekday * 24 + hour)
+        return hour_mask
+    
+    def is_trading_hours(self, now: datetime) -> bool:
         """Vérifie si on est dans les heures de trading"""
-        if not self.config.TRADING_HOURS_ENABLED:
-            return True
-        
-        now = datetime.now()
-        current_hour = now.hour
-        
-        # Horaires de base (9h-23h)
-        if not (self.config.TRADING_START_HOUR <= current_hour < self.config.TRADING_END_HOUR):
-            return False
-        
-        # Week-end
-        if now.weekday() >= 5:  # Samedi (5) et Dimanche (6)
-            if not self.config.WEEKEND_TRADING_ENABLED:
-                return False
-        
-        return True
+        return bool(self._hour_mask >> (now.weekday() * 24 + now.hour) & 1)
     
-    def check_anti_surtrading(self) -> bool:
+    def check_anti_surtrading(self, now: datetime) -> bool:
         """Vérifie les règles anti-surtrading"""
-        now = datetime.now()
-        
         # Reset compteur horaire
         if now.hour != self.last_hour_reset:
             self.trades_this_hour = 0
@@ -346,7 +489,11 @@ class RSIScalpingBot:
         return True
     
     async def get_current_capital(self) -> float:
-        """Récupère le capital USDC actuel"""
+        """Récupère le capital USDC actuel (mis en cache entre deux trades)"""
+        expires_at, capital = self._cached_capital
+        if time.monotonic() < expires_at:
+            return capital
+        
         try:
             balance = await self.data_fetcher.get_account_balance()
             usdc_balance = 0.0
@@ -355,11 +502,38 @@ class RSIScalpingBot:
             if 'USDC' in balance:
                 usdc_balance = float(balance['USDC']['free'])
             
+            self._cached_capital = (time.monotonic() + self.CAPITAL_CACHE_TTL_SECONDS, usdc_balance)
             return usdc_balance
         except Exception as e:
             self.logger.error(f"❌ Erreur récupération capital: {e}")
             return 0.0
     
+    @staticmethod
+    def _aggregate_trades_pnl(trades_query, op: str) -> Tuple[int, float]:
+        """Nombre de trades et somme des P&L (pnl_amount op 0), en une requête d'agrégation"""
+        aggregation = trades_query.where('pnl_amount', op, 0).count(alias='count').sum('pnl_amount', alias='pnl')
+        results = {result.alias: result.value for result in aggregation.get()[0]}
+        return int(results.get('count') or 0), float(results.get('pnl') or 0.0)
+    
+    @staticmethod
+    def _tally_trades_pnl(trades_query) -> Tuple[int, int, float]:
+        """Comptage local des trades gagnants/perdants et du P&L total"""
+        winning_trades = 0
+        losing_trades = 0
+        total_pnl = 0.0
+        
+        for trade_doc in trades_query.stream():
+            pnl = float(trade_doc.to_dict().get('pnl_amount', 0))
+            
+            if pnl > 0:
+                winning_trades += 1
+            elif pnl < 0:
+                losing_trades += 1
+            
+            total_pnl += pnl
+        
+        return winning_trades, losing_trades, total_pnl
+    
     async def get_daily_stats_from_firebase(self) -> dict:
         """Calcule les statistiques quotidiennes depuis Firebase"""
         try:
@@ -376,29 +550,31 @@ class RSIScalpingBot:
             today = datetime.now().date()
             today_str = today.isoformat()
             
-            # Récupérer les trades du jour depuis Firebase
-            trades_ref = self.firebase_logger.db.collection('trades')
-            today_trades = trades_ref.where('date', '==', today_str).stream()
-            
-            winning_trades = 0
-            losing_trades = 0
-            total_pnl = 0.0
+            # Statistiques agrégées côté serveur: gains et pertes en parallèle, plus le document health
+            trades_query = self.firebase_logger.db.collection('trades').where('date', '==', today_str)
+            health_ref = self.firebase_logger.db.collection('binance_live').document('health')
+            loop = asyncio.get_running_loop()
             
-            for trade_doc in today_trades:
-                trade_data = trade_doc.to_dict()
-                pnl = float(trade_data.get('pnl_amount', 0))
-                
-                if pnl > 0:
-                    winning_trades += 1
-                elif pnl < 0:
-                    losing_trades += 1
-                
-                total_pnl += pnl
+            try:
+                wins, losses, health_doc = await asyncio.gather(
+                    loop.run_in_executor(None, self._aggregate_trades_pnl, trades_query, '>'),
+                    loop.run_in_executor(None, self._aggregate_trades_pnl, trades_query, '<'),
+                    loop.run_in_executor(None, health_ref.get)
+                )
+                winning_trades, winning_pnl = wins
+                losing_trades, losing_pnl = losses
+                total_pnl = winning_pnl + losing_pnl
+            except Exception as e:
+                # Client Firestore sans sum() ou index composite manquant: comptage local
+                self.logger.debug(f"Agrégation Firestore indisponible ({e}), lecture des trades")
+                winning_trades, losing_trades, total_pnl = await loop.run_in_executor(
+                    None, self._tally_trades_pnl, trades_query
+                )
+                health_doc = await loop.run_in_executor(None, health_ref.get)
             
             # Calculer l'uptime depuis Firebase health
             uptime_hours = 0
             try:
-                health_doc = self.firebase_logger.db.collection('binance_live').document('health').get()
                 if health_doc.exists:
                     health_data = health_doc.to_dict()
                     if 'timestamp' in health_data:
@@ -426,46 +602,71 @@ class RSIScalpingBot:
                 'uptime_hours': 0
             }
     
+    async def get_usdc_pairs(self) -> List[str]:
+        """Liste des paires USDC actives, mise en cache (la liste d'exchange évolue sur des jours)"""
+        expires_at, usdc_pairs = self._usdc_pairs_cache
+        if time.monotonic() < expires_at:
+            return usdc_pairs
+        
+        all_pairs = await self.data_fetcher.get_all_pairs()
+        usdc_pairs = [pair for pair in all_pairs if pair[-4:] == 'USDC']
+        self._usdc_pairs_cache = (time.monotonic() + self.PAIRS_CACHE_TTL_SECONDS, usdc_pairs)
+        return usdc_pairs
+    
+    async def _get_ticker_bounded(self, pair: str) -> Optional[Dict]:
+        """Récupère un ticker en limitant le nombre de requêtes Binance simultanées"""
+        async with self._api_semaphore:
+            return await self.data_fetcher.get_ticker(pair)
+    
     async def scan_pairs(self) -> List[str]:
         """Scan et sélection des paires à analyser"""
         try:
-            # Récupération de toutes les paires USDC
-            all_pairs = await self.data_fetcher.get_all_pairs()
-            usdc_pairs = [pair for pair in all_pairs if pair.endswith('USDC')]
+            # Récupération de toutes les paires USDC (liste d'exchange mise en cache 1h)
+            usdc_pairs = await self.get_usdc_pairs()
             
             # Filtrage par volume et critères
             valid_pairs = []
-            rejected_count = 0
-            
-            for pair in usdc_pairs:
-                # Vérification blacklist
-                symbol = pair.replace('USDC', '')
-                if symbol in self.config.BLACKLISTED_SYMBOLS:
-                    if self.firebase_logger:
-                        await self.firebase_logger.log_pair_rejected_detailed(
-                            pair, "symbole en blacklist", {'symbol': symbol}
-                        )
-                    rejected_count += 1
-                    continue
-                
+            rejections = []  # Écrites en un seul batch Firebase à la fin du scan
+            
+            # 1. Filtre local (blacklist), refait seulement quand la liste d'exchange est rafraîchie
+            #    (rejets de blacklist journalisés une fois par rafraîchissement)
+            source_pairs, candidates = self._scan_candidates
+            if source_pairs is not usdc_pairs:
+                candidates = []
+                blacklist = self._blacklist
+                for pair in usdc_pairs:
+                    symbol = pair[:-4]
+                    if pair in blacklist or symbol in blacklist:
+                        rejections.append({'pair': pair, 'reason': "symbole en blacklist", 'details': {'symbol': symbol}})
+                        continue
+                    candidates.append(pair)
+                self._scan_candidates = (usdc_pairs, candidates)
+            
+            # 2. Tickers 24h de toutes les paires USDC en une seule requête (cache 60s),
+            #    requêtes concurrentes par paire en secours
+            try:
+                all_tickers = {ticker['symbol']: ticker for ticker in await self.data_fetcher.get_24hr_ticker_stats()}
+                tickers = [all_tickers.get(pair) for pair in candidates]
+            except Exception as e:
+                self.logger.warning(f"⚠️ Tickers 24h groupés indisponibles ({e}), requêtes par paire")
+                tickers = await asyncio.gather(
+                    *(self._get_ticker_bounded(pair) for pair in candidates),
+                    return_exceptions=True
+                )
+            
+            # 3. Application des seuils volume / spread / volatilité
+            for pair, ticker in zip(candidates, tickers):
                 # Vérification volume et spread
-                ticker = await self.data_fetcher.get_ticker(pair)
-                if not ticker:
-                    if self.firebase_logger:
-                        await self.firebase_logger.log_pair_rejected_detailed(
-                            pair, "données ticker indisponibles"
-                        )
-                    rejected_count += 1
+                if not ticker or isinstance(ticker, Exception):
+                    rejections.append({'pair': pair, 'reason': "données ticker indisponibles"})
                     continue
                 
                 volume_usdc = float(ticker.get('quoteVolume', 0))
                 if volume_usdc < self.config.MIN_VOLUME_USDC:
-                    if self.firebase_logger:
-                        await self.firebase_logger.log_pair_rejected_detailed(
-                            pair, f"volume trop faible ({volume_usdc:.0f} USDC)", 
-                            volume=volume_usdc
-                        )
-                    rejected_count += 1
+                    rejections.append({
+                        'pair': pair, 'reason': f"volume trop faible ({volume_usdc:.0f} USDC)",
+                        'volume': volume_usdc
+                    })
                     continue
                 
                 # Calcul du spread
@@ -474,23 +675,19 @@ class RSIScalpingBot:
                 if bid > 0:
                     spread = (ask - bid) / bid * 100
                     if spread > self.config.MAX_SPREAD_PERCENT:
-                        if self.firebase_logger:
-                            await self.firebase_logger.log_pair_rejected_detailed(
-                                pair, f"spread trop élevé ({spread:.2f}%)", 
-                                spread=spread, volume=volume_usdc
-                            )
-                        rejected_count += 1
+                        rejections.append({
+                            'pair': pair, 'reason': f"spread trop élevé ({spread:.2f}%)",
+                            'spread': spread, 'volume': volume_usdc
+                        })
                         continue
                 
                 # Vérification volatilité
                 price_change_percent = abs(float(ticker.get('priceChangePercent', 0)))
                 if price_change_percent < self.config.MIN_VOLATILITY_PERCENT:
-                    if self.firebase_logger:
-                        await self.firebase_logger.log_pair_rejected_detailed(
-                            pair, f"volatilité trop faible ({price_change_percent:.1f}%)", 
-                            volatility=price_change_percent, volume=volume_usdc
-                        )
-                    rejected_count += 1
+                    rejections.append({
+                        'pair': pair, 'reason': f"volatilité trop faible ({price_change_percent:.1f}%)",
+                        'volatility': price_change_percent, 'volume': volume_usdc
+                    })
                     continue
                 
                 valid_pairs.append(pair)
@@ -499,7 +696,11 @@ class RSIScalpingBot:
                 if len(valid_pairs) >= 7:
                     break
             
-            message = f"📊 {len(valid_pairs)} paires sélectionnées pour analyse ({rejected_count} rejetées)"
+            # Toutes les paires rejetées en une seule écriture Firebase
+            if self.firebase_logger:
+                await self.firebase_logger.log_pairs_rejected_batch(rejections)
+            
+            message = f"📊 {len(valid_pairs)} paires sélectionnées pour analyse ({len(rejections)} rejetées)"
             self.logger.info(message)
             
             # Log console mirror
@@ -512,82 +713,176 @@ class RSIScalpingBot:
             self.logger.error(f"❌ Erreur scan des paires: {e}")
             return []
     
-    def _get_latest_value(self, data):
-        """Helper pour récupérer la dernière valeur, que ce soit un float ou une Series"""
-        if hasattr(data, 'iloc'):
-            return data.iloc[-1]
-        elif hasattr(data, '__len__') and len(data) > 0:
-            return data[-1]
-        else:
-            return data
+    async def _warm_up_indicator_state(self, pair: str) -> Optional[List]:
+        """Reconstruit l'état des indicateurs d'une paire sur 100 bougies 1m
+        
+        Returns:
+            La bougie en cours (non clôturée), ou None si l'historique est insuffisant
+        """
+        klines = self.data_fetcher.get_stream_klines(pair, limit=100)
+        if klines is None:
+            async with self._api_semaphore:
+                klines = await self.data_fetcher.get_klines(pair, "1m", limit=100)
+        if not klines or len(klines) < 50:
+            self.indicator_states.pop(pair, None)
+            return None
+        
+        state = IndicatorState()
+        for kline in klines[:-1]:
+            state.update(kline[0], kline[4], kline[2], kline[5])
+        self._remember(self.indicator_states, pair, state)
+        return klines[-1]
+    
+    def _remember(self, cache: OrderedDict, pair: str, value):
+        """Insère ou rafraîchit une entrée LRU et évince les paires les moins récemment analysées"""
+        cache[pair] = value
+        cache.move_to_end(pair)
+        while len(cache) > self.INDICATOR_CACHE_MAX_PAIRS:
+            cache.popitem(last=False)
+    
+    async def _refresh_indicator_state(self, pair: str) -> Optional[List]:
+        """Avance l'état des indicateurs avec les seules bougies clôturées depuis le dernier cycle
+        
+        Paire revue après quelques minutes (ex: sortie puis retour dans la sélection du scan):
+        seules les bougies manquantes sont demandées. Démarrage, paire inconnue, absence de plus
+        de 100 bougies ou trou inattendu: nouveau préchauffage complet.
+        
+        Returns:
+            La bougie en cours (non clôturée), ou None si l'historique est insuffisant
+        """
+        state = self.indicator_states.get(pair)
+        if state is None or not state.is_ready:
+            return await self._warm_up_indicator_state(pair)
+        
+        # Bougies clôturées manquantes + la bougie en cours (au moins 3 pour couvrir un décalage d'horloge)
+        elapsed_candles = (int(time.time() * 1000) - state.last_open_time) // 60_000
+        limit = max(3, elapsed_candles + 2)
+        if limit > 100:
+            return await self._warm_up_indicator_state(pair)
+        
+        # Flux WebSocket en priorité (aucune I/O), REST en secours
+        klines = self.data_fetcher.get_stream_klines(pair, limit=limit)
+        if klines is None:
+            async with self._api_semaphore:
+                klines = await self.data_fetcher.get_klines(pair, "1m", limit=limit)
+        if not klines:
+            return None
+        
+        new_klines = [kline for kline in klines[:-1] if kline[0] > state.last_open_time]
+        if new_klines and new_klines[0][0] != state.last_open_time + 60_000:
+            return await self._warm_up_indicator_state(pair)
+        if klines[-1][0] > state.last_open_time + 60_000 * (len(new_klines) + 1):
+            return await self._warm_up_indicator_state(pair)
+        
+        for kline in new_klines:
+            state.update(kline[0], kline[4], kline[2], kline[5])
+        # Réinséré après les await: l'état reste présent même s'il a été évincé entre-temps
+        self._remember(self.indicator_states, pair, state)
+        return klines[-1]
     
     async def analyze_pair(self, pair: str) -> Tuple[bool, Dict]:
         """Analyse une paire selon la stratégie RSI Scalping"""
         try:
-            # Récupération des données 1m
-            klines = await self.data_fetcher.get_klines(pair, "1m", limit=100)
-            if not klines or len(klines) < 50:
+            # Bougie 1m en cours; l'état des bougies clôturées est mis à jour en O(1)
+            current_kline = await self._refresh_indicator_state(pair)
+            if current_kline is None:
                 return False, {}
             
-            # Conversion en DataFrame
-            df = pd.DataFrame(klines, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_volume', 'trades', 'taker_buy_volume',
-                'taker_buy_quote_volume', 'ignore'
-            ])
+            # Aucune bougie clôturée ni tick depuis la dernière analyse: résultat identique
+            # (déjà journalisé), aucun recalcul
+            state = self.indicator_states[pair]
+            analysis_key = (
+                state.last_open_time,
+                current_kline[0], current_kline[2], current_kline[4], current_kline[5]
+            )
+            cached = self._analysis_cache.get(pair)
+            if cached is not None and cached[0] == analysis_key:
+                self._analysis_cache.move_to_end(pair)
+                return cached[1], cached[2]
+            
+            # Valeurs scalaires calculées une seule fois
+            current_price = float(current_kline[4])
+            current_volume = float(current_kline[5])
+            
+            values = state.snapshot(current_price, float(current_kline[2]), current_volume)
+            recent_highs = values['recent_high']
+            breakout_level = recent_highs * self.ENTRY_BREAKOUT_MULTIPLIER
+            
+            current_rsi = values['rsi']
+            ema9_value = values['ema_fast']
+            ema21_value = values['ema_slow']
+            macd_value = values['macd']
+            signal_value = values['signal']
+            bb_lower = values['bb_lower']
+            volume_ma_value = values['volume_sma']
+            
+            # Analyse des conditions, des moins coûteuses aux plus coûteuses, avec arrêt dès que
+            # 4 conditions sur 6 ne sont plus atteignables (flags est alors partiel).
+            # Un bit par condition remplie, libellés construits seulement s'ils sont utilisés.
+            flags = 0
+            max_failed = self.ENTRY_CONDITIONS_TOTAL - self.ENTRY_MIN_CONDITIONS
+            failed = 0
+            
+            # 1. Cassure +0.07% du dernier haut local (5 bougies)
+            if current_price > breakout_level:
+                flags |= 1
+            else:
+                failed += 1
             
-            # Conversion des types
-            for col in ['open', 'high', 'low', 'close', 'volume', 'quote_volume']:
-                df[col] = pd.to_numeric(df[col])
+            # 2. Volume > moyenne mobile volume (20)
+            if current_volume > volume_ma_value:
+                flags |= 2
+            else:
+                failed += 1
             
-            # Analyse des conditions
-            conditions_met = []
+            # 3. EMA(9) > EMA(21) (reprise haussière)
+            if failed <= max_failed:
+                if ema9_value > ema21_value:
+                    flags |= 4
+                else:
+                    failed += 1
             
-            # 1. RSI 14 < 28 (zone de survente profonde)
-            rsi = self.indicators.calculate_rsi(df['close'], period=14)
-            current_rsi = self._get_latest_value(rsi)
-            if current_rsi < 28:
-                conditions_met.append(f"RSI < 28 ({current_rsi:.1f})")
-            
-            # 2. EMA(9) > EMA(21) (reprise haussière)
-            ema9 = self.indicators.calculate_ema(df['close'], period=9)
-            ema21 = self.indicators.calculate_ema(df['close'], period=21)
-            ema9_value = self._get_latest_value(ema9)
-            ema21_value = self._get_latest_value(ema21)
-            if ema9_value > ema21_value:
-                conditions_met.append(f"EMA9 > EMA21 ({ema9_value:.4f} > {ema21_value:.4f})")
-            
-            # 3. MACD > Signal (confirmation momentum)
-            macd_data = self.indicators.calculate_macd(df['close'])
-            macd_value = self._get_latest_value(macd_data['macd'])
-            signal_value = self._get_latest_value(macd_data['signal'])
-            if macd_value > signal_value:
-                conditions_met.append("MACD > Signal")
-            
-            # 4. Prix proche/cassure Bollinger inférieur
-            bb_data = self.indicators.calculate_bollinger_bands(df['close'])
-            current_price = df['close'].iloc[-1]
-            bb_lower = self._get_latest_value(bb_data['lower'])
-            distance_to_lower = abs(current_price - bb_lower) / bb_lower
-            if distance_to_lower <= 0.005:  # 0.5% de marge
-                conditions_met.append(f"Prix proche BB inf. (distance: {distance_to_lower*100:.2f}%)")
-            
-            # 5. Volume > moyenne mobile volume (20)
-            volume_ma = self.indicators.calculate_volume_sma(df['volume'], period=20)
-            current_volume = df['volume'].iloc[-1]
-            volume_ma_value = self._get_latest_value(volume_ma)
-            if current_volume > volume_ma_value:
-                conditions_met.append(f"Volume élevé ({current_volume/volume_ma_value:.1f}x)")
+            # 4. RSI 14 < 28 (zone de survente profonde)
+            if failed <= max_failed:
+                if current_rsi < self.ENTRY_RSI_OVERSOLD:
+                    flags |= 8
+                else:
+                    failed += 1
             
-            # 6. Cassure +0.07% du dernier haut local (5 bougies)
-            recent_highs = df['high'].iloc[-5:].max()
-            breakout_level = recent_highs * 1.0007
-            if current_price > breakout_level:
-                conditions_met.append(f"Cassure haut local (+{((current_price/recent_highs-1)*100):.2f}%)")
+            # 5. MACD > Signal (confirmation momentum)
+            if failed <= max_failed:
+                if macd_value > signal_value:
+                    flags |= 16
+                else:
+                    failed += 1
             
-            # Vérification: minimum 4 conditions sur 5
-            signal_strength = len(conditions_met)
-            is_valid_signal = signal_strength >= 4
+            # 6. Prix proche/cassure Bollinger inférieur
+            if failed <= max_failed:
+                distance_to_lower = abs(current_price - bb_lower) / bb_lower
+                if distance_to_lower <= self.ENTRY_BB_MAX_DISTANCE:
+                    flags |= 32
+            
+            # Vérification: minimum 4 conditions sur 6. Après un arrêt anticipé, la force n'est
+            # qu'un minorant (conditions restantes non évaluées) et le signal est toujours invalide
+            early_exit = failed > max_failed
+            signal_strength = bin(flags).count('1')
+            is_valid_signal = signal_strength >= self.ENTRY_MIN_CONDITIONS
+            
+            # Libellés des conditions remplies (logs du signal valide et Firebase uniquement)
+            conditions_met = []
+            if is_valid_signal or self.firebase_logger:
+                if flags & 1:
+                    conditions_met.append(f"Cassure haut local (+{((current_price/recent_highs-1)*100):.2f}%)")
+                if flags & 2:
+                    conditions_met.append(f"Volume élevé ({current_volume/volume_ma_value:.1f}x)")
+                if flags & 4:
+                    conditions_met.append(f"EMA9 > EMA21 ({ema9_value:.4f} > {ema21_value:.4f})")
+                if flags & 8:
+                    conditions_met.append(f"RSI < {self.ENTRY_RSI_OVERSOLD:g} ({current_rsi:.1f})")
+                if flags & 16:
+                    conditions_met.append("MACD > Signal")
+                if flags & 32:
+                    conditions_met.append(f"Prix proche BB inf. (distance: {distance_to_lower*100:.2f}%)")
             
             analysis_data = {
                 'pair': pair,
@@ -602,11 +897,12 @@ class RSIScalpingBot:
                 'breakout_level': breakout_level,
                 'conditions_met': conditions_met,
                 'signal_strength': signal_strength,
+                'early_exit': early_exit,
                 'is_valid': is_valid_signal
             }
             
             if is_valid_signal:
-                message = f"✅ Signal valide détecté pour {pair}: {signal_strength}/6 conditions"
+                message = f"✅ Signal valide détecté pour {pair}: {signal_strength}/{self.ENTRY_CONDITIONS_TOTAL} conditions"
                 self.logger.info(message)
                 for condition in conditions_met:
                     self.logger.info(f"  ✓ {condition}")
@@ -618,12 +914,16 @@ class RSIScalpingBot:
                     )
             else:
                 # Log signal ignoré
-                reason = f"force insuffisante ({signal_strength}/6)"
+                if early_exit:
+                    reason = f"force insuffisante (évaluation interrompue, ≥{signal_strength}/{self.ENTRY_CONDITIONS_TOTAL})"
+                else:
+                    reason = f"force insuffisante ({signal_strength}/{self.ENTRY_CONDITIONS_TOTAL})"
                 if self.firebase_logger:
                     await self.firebase_logger.log_signal_detected(
                         pair, analysis_data, False, signal_strength, reason
                     )
             
+            self._remember(self._analysis_cache, pair, (analysis_key, is_valid_signal, analysis_data))
             return is_valid_signal, analysis_data
             
         except Exception as e:
@@ -634,42 +934,29 @@ class RSIScalpingBot:
         """Exécute un ordre d'achat"""
         try:
             # Vérification dernier trade sur cette paire (1 trade/paire/heure)
-            now = datetime.now()
-            if pair in self.last_trade_time:
-                time_since_last = (now - self.last_trade_time[pair]).total_seconds()
+            now_monotonic = time.monotonic()
+            if pair in self._last_trade_monotonic:
+                time_since_last = now_monotonic - self._last_trade_monotonic[pair]
                 if time_since_last < 3600:  # 1 heure
                     self.logger.info(f"⏳ Attente cooldown pour {pair}: {3600-time_since_last:.0f}s")
                     return False
             
             # Vérification délai entre trades (300s minimum)
-            if self.last_trade_time:
-                last_trade = max(self.last_trade_time.values())
-                time_since_any_trade = (now - last_trade).total_seconds()
+            if self._latest_trade_monotonic is not None:
+                time_since_any_trade = now_monotonic - self._latest_trade_monotonic
                 if time_since_any_trade < 300:
                     self.logger.info(f"⏳ Attente délai anti-surtrading: {300-time_since_any_trade:.0f}s")
                     return False
             
-            # Calcul de la taille de position
+            # Garde-fou capital: 20-25% du capital (cache 30s) doit atteindre la taille minimale.
+            # Quantité, TP et SL sont calculés par open_trade sur le prix d'exécution.
             current_capital = await self.get_current_capital()
-            position_size_percent = np.random.uniform(20, 25)  # Entre 20-25%
+            position_size_percent = random.uniform(20.0, 25.0)  # Entre 20-25%
             position_value = current_capital * (position_size_percent / 100)
-            
-            # Vérification taille min/max
             if position_value < self.config.MIN_POSITION_SIZE_USDC:
                 self.logger.warning(f"⚠️ Position trop petite: {position_value:.2f} < {self.config.MIN_POSITION_SIZE_USDC}")
                 return False
             
-            if position_value > self.config.MAX_POSITION_SIZE_USDC:
-                position_value = self.config.MAX_POSITION_SIZE_USDC
-            
-            # Calcul de la quantité
-            current_price = analysis_data['current_price']
-            quantity = position_value / current_price
-            
-            # Calcul des niveaux TP/SL
-            take_profit_price = current_price * (1 + self.config.TAKE_PROFIT_PERCENT / 100)
-            stop_loss_price = current_price * (1 - self.config.STOP_LOSS_PERCENT / 100)
-            
             # Exécution de l'ordre via open_trade
             trade_result = await self.trade_executor.open_trade(
                 pair=pair,
@@ -677,6 +964,11 @@ class RSIScalpingBot:
             )
             
             if trade_result is not None:
+                entry_monotonic = time.monotonic()
+                
+                # Le solde USDC a changé
+                self._cached_capital = (0.0, 0.0)
+                
                 # Enregistrement de la position UNIQUEMENT (pas de re-logging)
                 self.open_positions[pair] = {
                     'entry_price': trade_result.entry_price,
@@ -685,19 +977,24 @@ class RSIScalpingBot:
                     'stop_loss': trade_result.stop_loss,
                     'entry_time': trade_result.timestamp,
                     'position_value': trade_result.capital_engaged,
-                    'analysis_data': analysis_data
+                    'analysis_data': analysis_data,
+                    'entry_monotonic': entry_monotonic,
+                    'next_log_time': entry_monotonic + 300,
+                    'base_asset': pair[:-4]
                 }
                 
                 # Mise à jour des compteurs
-                self.last_trade_time[pair] = now
+                self.last_trade_time[pair] = self._cycle_now
+                self._last_trade_monotonic[pair] = entry_monotonic
+                self._latest_trade_monotonic = entry_monotonic
                 self.trades_today += 1
                 self.trades_this_hour += 1
                 
                 # Log simple dans main.py
                 self.logger.info(f"✅ Trade {pair} enregistré dans les positions ouvertes")
                 
-                # Sauvegarde de l'état après chaque trade
-                await self.save_state()
+                # Sauvegarde de l'état après chaque trade (en arrière-plan)
+                self.request_state_save()
                 
                 return True
             
@@ -711,102 +1008,145 @@ class RSIScalpingBot:
         """Surveillance des positions ouvertes"""
         try:
             positions_to_remove = []
+            manual_closes = []  # (paire, raison)
+            momentum_checks = []
             
-            for pair, position in list(self.open_positions.items()):
+            # Prix de toutes les positions: flux miniTicker, puis une seule requête REST groupée pour le reste
+            prices = {pair: self.data_fetcher.get_stream_price(pair) for pair in self.open_positions}
+            missing_prices = [pair for pair, price in prices.items() if price is None]
+            if missing_prices:
+                prices.update(await self.data_fetcher.get_tickers(missing_prices))
+            
+            # Soldes lus une seule fois pour toutes les positions (flux userData, REST si indisponible)
+            try:
+                account_info = self.data_fetcher.get_stream_balance_amounts()
+                if account_info is None:
+                    account_info = self.data_fetcher.balance_amounts(await self.data_fetcher.get_account_balance())
+            except Exception as e:
+                self.logger.warning(f"⚠️ Impossible de vérifier le statut Binance des positions: {e}")
+                account_info = None
+            
+            # Passe de classification sans await ni mutation: itération directe, sans copie du dict
+            now = time.monotonic()
+            for pair, position in self.open_positions.items():
                 # 1. VÉRIFICATION D'ABORD si la position existe encore sur Binance
-                try:
-                    # Récupérer les positions ouvertes depuis Binance
-                    account_info = await self.data_fetcher.get_account_balance()
-                    symbol_without_usdc = pair.replace('USDC', '')
-                    
-                    # Vérifier si on a encore du balance de cette crypto
-                    has_balance = False
-                    if symbol_without_usdc in account_info:
-                        balance = float(account_info[symbol_without_usdc]['free'])
-                        locked = float(account_info[symbol_without_usdc]['locked'])
+                # (ignorée ce cycle si les soldes sont indisponibles)
+                if account_info is not None:
+                    try:
+                        # Vérifier si on a encore du balance de cette crypto (montants déjà en float)
+                        balance, locked = account_info.get(position['base_asset'], (0.0, 0.0))
                         total_balance = balance + locked
                         
-                        # Si le balance est très proche de la quantité de la position
-                        if abs(total_balance - position['quantity']) < 0.001:
-                            has_balance = True
-                    
-                    # Si plus de balance, la position a été fermée automatiquement
-                    if not has_balance:
-                        self.logger.info(f"🔄 Position {pair} fermée automatiquement par TP/SL sur Binance")
-                        positions_to_remove.append(pair)
-                        continue
+                        # Position toujours détenue tant que le solde couvre la quantité achetée, à
+                        # l'arrondi du pas de lot, aux frais et à la poussière près (une sortie TP/SL
+                        # ne laisse que de la poussière)
+                        quantity = position['quantity']
+                        has_balance = total_balance >= quantity * (1 - self.POSITION_BALANCE_TOLERANCE)
                         
-                except Exception as e:
-                    self.logger.warning(f"⚠️ Impossible de vérifier le statut Binance pour {pair}: {e}")
+                        # Si plus de balance, la position a été fermée automatiquement
+                        if not has_balance:
+                            self.logger.info(f"🔄 Position {pair} fermée automatiquement par TP/SL sur Binance")
+                            positions_to_remove.append(pair)
+                            continue
+                            
+                    except Exception as e:
+                        self.logger.warning(f"⚠️ Impossible de vérifier le statut Binance pour {pair}: {e}")
                 
-                # 2. Récupération du prix actuel pour monitoring manuel
-                ticker = await self.data_fetcher.get_ticker(pair)
-                if not ticker:
+                # 2. Prix actuel pour monitoring manuel
+                current_price = prices.get(pair)
+                if current_price is None:
                     continue
-                
-                current_price = float(ticker['lastPrice'])
                 entry_price = position['entry_price']
                 pnl_percent = (current_price - entry_price) / entry_price * 100
                 
-                # Log du statut de la position toutes les 5 minutes
-                time_in_position = (datetime.now() - position['entry_time']).total_seconds() / 60
-                if int(time_in_position) % 5 == 0:  # Log toutes les 5 minutes
+                # Log du statut de la position toutes les 5 minutes (échéance monotone stockée sur la position)
+                time_in_position = (now - position['entry_monotonic']) / 60
+                next_log_time = position.get('next_log_time')
+                if next_log_time is None or now >= next_log_time:
                     self.logger.info(f"📊 {pair}: Prix {current_price:.4f} | P&L: {pnl_percent:+.2f}% | Temps: {time_in_position:.0f}min")
+                    position['next_log_time'] = now + 300
                 
                 # 3. Vérifications de sortie manuelle (en plus des TP/SL automatiques)
-                should_close = False
-                close_reason = ""
-                
                 # Timeout si stagne dans [-0.1%, +0.2%] après 10 minutes
                 if time_in_position > 10 and -0.1 <= pnl_percent <= 0.2:
-                    should_close = True
-                    close_reason = "Timeout stagnation (10min)"
+                    manual_closes.append((pair, "Timeout stagnation (10min)"))
                 
-                # Sortie anticipée si momentum très faible après 5 minutes
-                elif time_in_position > 5:
-                    try:
-                        # Récupération données pour vérifier momentum
-                        klines = await self.data_fetcher.get_klines(pair, "1m", limit=20)
-                        if klines:
-                            df = pd.DataFrame(klines, columns=[
-                                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                                'close_time', 'quote_volume', 'trades', 'taker_buy_volume',
-                                'taker_buy_quote_volume', 'ignore'
-                            ])
-                            df['close'] = pd.to_numeric(df['close'])
-                            
-                            # Vérification RSI et MACD
-                            rsi = self.indicators.calculate_rsi(df['close'], period=14)
-                            macd_data = self.indicators.calculate_macd(df['close'])
-                            
-                            # Conditions de sortie très strictes
-                            if (rsi.iloc[-1] < 25 and 
-                                macd_data['macd'].iloc[-1] < macd_data['signal'].iloc[-1] and
-                                pnl_percent < -0.2):  # Et en perte
-                                should_close = True
-                                close_reason = "Momentum très faible + perte"
-                    except Exception as e:
-                        self.logger.warning(f"⚠️ Erreur analyse momentum {pair}: {e}")
+                # Sortie anticipée si momentum très faible après 5 minutes (et en perte)
+                elif time_in_position > 5 and pnl_percent < -0.2:
+                    momentum_checks.append(pair)
+            
+            # Analyses momentum (klines + RSI/MACD) lancées en parallèle pour toutes les positions concernées
+            momentum_results = await asyncio.gather(
+                *(self._is_momentum_weak(pair) for pair in momentum_checks),
+                return_exceptions=True
+            )
+            for pair, is_weak in zip(momentum_checks, momentum_results):
+                if isinstance(is_weak, Exception):
+                    self.logger.warning(f"⚠️ Erreur analyse momentum {pair}: {is_weak}")
+                elif is_weak:
+                    manual_closes.append((pair, "Momentum très faible + perte"))
+            
+            # Exécuter les sorties manuelles
+            for pair, close_reason in manual_closes:
+                self.logger.info(f"🚨 Fermeture manuelle {pair}: {close_reason}")
+                await self.close_position(pair, close_reason)
+            
+            # Supprimer les positions fermées automatiquement (rien à faire dans le cas courant)
+            if positions_to_remove:
+                for pair in positions_to_remove:
+                    if self.open_positions.pop(pair, None) is not None:
+                        self.logger.info(f"🗑️ Position {pair} supprimée de la liste locale")
                 
-                # Exécuter la sortie manuelle si nécessaire
-                if should_close:
-                    self.logger.info(f"🚨 Fermeture manuelle {pair}: {close_reason}")
-                    await self.close_position(pair, close_reason)
+                # Solde modifié et état à sauvegarder
+                self._cached_capital = (0.0, 0.0)
+                self.request_state_save()
             
-            # Supprimer les positions fermées automatiquement
-            for pair in positions_to_remove:
-                if pair in self.open_positions:
-                    del self.open_positions[pair]
-                    self.logger.info(f"🗑️ Position {pair} supprimée de la liste locale")
-            
-            # Sauvegarder l'état si des positions ont été supprimées
-            if positions_to_remove:
-                await self.save_state()
+            # Oublier les indicateurs des positions fermées
+            for pair in self._indicator_cache.keys() - self.open_positions.keys():
+                del self._indicator_cache[pair]
                 
         except Exception as e:
-            self.logger.error(f"❌ Erreur surveillance positions: {e}")
-            import traceback
-            self.logger.error(traceback.format_exc())
+            self.logger.error(f"❌ Erreur surveillance positions: {e}", exc_info=True)
+    
+    async def _is_momentum_weak(self, pair: str) -> bool:
+        """Momentum très faible: RSI < 25 et MACD < Signal sur les bougies 1m récentes
+        
+        Les valeurs sont réutilisées tant que la bougie 1m en cours est la même (cycles de 40s).
+        """
+        current_candle_ms = int(time.time() * 1000) // 60_000 * 60_000
+        cached = self._indicator_cache.get(pair)
+        if cached is not None and cached[0] == current_candle_ms:
+            _, rsi, macd, signal = cached
+            return rsi < 25 and macd < signal
+        
+        # État incrémental de la paire (construit par analyze_pair avant l'entrée): seules les
+        # bougies clôturées depuis le dernier cycle sont demandées
+        current_kline = await self._refresh_indicator_state(pair)
+        if current_kline is not None:
+            values = self.indicator_states[pair].snapshot(
+                float(current_kline[4]), float(current_kline[2]), float(current_kline[5])
+            )
+            rsi, macd, signal = values['rsi'], values['macd'], values['signal']
+            candle_ms = current_kline[0]
+        else:
+            # Historique insuffisant pour l'état: état temporaire sur les bougies récentes, pour
+            # garder les mêmes définitions RSI/MACD/signal que le chemin incrémental.
+            # 26 + 9 bougies: fenêtre minimale du MACD (12/26/9), plus une marge pour stabiliser le signal
+            async with self._api_semaphore:
+                klines = await self.data_fetcher.get_klines(pair, "1m", limit=40)
+            if not klines:
+                return False
+            
+            state = IndicatorState()
+            for kline in klines[:-1]:
+                state.update(kline[0], float(kline[4]), float(kline[2]), float(kline[5]))
+            last_kline = klines[-1]
+            values = state.snapshot(float(last_kline[4]), float(last_kline[2]), float(last_kline[5]))
+            rsi, macd, signal = values['rsi'], values['macd'], values['signal']
+            candle_ms = last_kline[0]
+        
+        self._indicator_cache[pair] = (candle_ms, rsi, macd, signal)
+        return rsi < 25 and macd < signal
     
     async def close_position(self, pair: str, reason: str = "Manuel"):
         """Ferme une position"""
@@ -834,15 +1174,17 @@ class RSIScalpingBot:
                     self.consecutive_losses += 1
                     if self.consecutive_losses >= self.config.MAX_LOSS_STREAK:
                         self.loss_streak_pause_until = datetime.now() + timedelta(minutes=60)
+                        self._pause_until_monotonic = time.monotonic() + 3600
                         self.logger.warning(f"🛑 Pause 60min après {self.consecutive_losses} pertes consécutives")
                 else:
                     self.consecutive_losses = 0
                 
                 # Suppression de la position
                 del self.open_positions[pair]
+                self._cached_capital = (0.0, 0.0)
                 
-                # Sauvegarde de l'état après fermeture
-                await self.save_state()
+                # Sauvegarde de l'état après fermeture (en arrière-plan)
+                self.request_state_save()
                 
                 # Log simple dans main.py
                 self.logger.info(f"✅ Position {pair} fermée | P&L: {pnl_amount:+.2f} USDC ({pnl_percent:+.2f}%) | Raison: {reason}")
@@ -850,17 +1192,34 @@ class RSIScalpingBot:
         except Exception as e:
             self.logger.error(f"❌ Erreur fermeture position {pair}: {e}")
     
+    async def _wait_next_cycle(self, timeout: float = 40):
+        """Attend un événement marché (bougie 1m clôturée, solde, ordre exécuté) ou au plus timeout secondes"""
+        wakeup = self.data_fetcher.market_event
+        try:
+            await asyncio.wait_for(wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        wakeup.clear()
+    
     async def main_loop(self):
         """Boucle principale du bot"""
         self.logger.info("🚀 Démarrage de la boucle principale")
         
+        # Écriture de l'état Firebase en arrière-plan
+        self._state_writer_task = asyncio.create_task(self._state_writer())
+        
         # Notification de démarrage
         if self.telegram_notifier:
             capital = await self.get_current_capital()
             await self.telegram_notifier.send_start_notification(capital)
         
         while self.is_running:
+            self._cycle_now = datetime.now()
             try:
+                # Notifications Telegram différées de l'itération précédente (un envoi groupé)
+                if self.telegram_notifier:
+                    await self.telegram_notifier.flush_messages()
+                
                 # Log de debug périodique (toutes les 20 boucles = ~13 minutes)
                 if hasattr(self, 'loop_counter'):
                     self.loop_counter += 1
@@ -869,8 +1228,8 @@ class RSIScalpingBot:
                 
                 if self.loop_counter % 20 == 0:
                     self.logger.info(f"🔄 Boucle #{self.loop_counter} - Positions ouvertes: {len(self.open_positions)} - Capital: {await self.get_current_capital():.2f} USDC")
-                    # Sauvegarde périodique de l'état
-                    await self.save_state()
+                    # Sauvegarde périodique de l'état (ignorée si un trade vient de la sauvegarder)
+                    await self.save_state(force=False)
                 
                 # Vérification des conditions de trading
                 if not await self.check_trading_conditions():
@@ -879,7 +1238,7 @@ class RSIScalpingBot:
                         if self.loop_counter % 10 == 0:  # Log moins fréquent
                             self.logger.info(f"⏸️ Max positions atteint ({len(self.open_positions)}/{self.config.MAX_OPEN_POSITIONS})")
                     
-                    await asyncio.sleep(40)  # Scan toutes les 40 secondes
+                    await self._wait_next_cycle()  # Scan toutes les 40 secondes au plus
                     continue
                 
                 # Surveillance des positions ouvertes
@@ -889,14 +1248,24 @@ class RSIScalpingBot:
                 if len(self.open_positions) < self.config.MAX_OPEN_POSITIONS:
                     pairs_to_analyze = await self.scan_pairs()
                     
-                    for pair in pairs_to_analyze:
-                        # Éviter les paires déjà en position
-                        if pair in self.open_positions:
-                            continue
-                        
-                        # Analyse de la paire
-                        is_signal, analysis_data = await self.analyze_pair(pair)
-                        
+                    # Éviter les paires déjà en position
+                    pairs_to_analyze = [pair for pair in pairs_to_analyze if pair not in self.open_positions]
+                    
+                    # Flux WebSocket des bougies 1m (réabonnement seulement si la sélection change)
+                    await self.data_fetcher.start_kline_stream(pairs_to_analyze)
+                    
+                    # Analyse concurrente des paires (klines REST bornées par le sémaphore API)
+                    analyses = await asyncio.gather(*(self.analyze_pair(pair) for pair in pairs_to_analyze))
+                    
+                    # Signaux les plus forts d'abord (ordre du scan conservé à force égale); les
+                    # évaluations interrompues n'ont qu'une force partielle et ne sont pas classées
+                    ranked = sorted(
+                        (item for item in zip(pairs_to_analyze, analyses) if not item[1][1].get('early_exit')),
+                        key=lambda item: item[1][1].get('signal_strength', 0),
+                        reverse=True
+                    )
+                    
+                    for pair, (is_signal, analysis_data) in ranked:
                         if is_signal:
                             # Tentative d'achat
                             success = await self.execute_buy_order(pair, analysis_data)
@@ -905,34 +1274,52 @@ class RSIScalpingBot:
                                 await asyncio.sleep(10)
                                 break
                 
-                # Attente avant le prochain cycle
-                await asyncio.sleep(40)
+                # Attente avant le prochain cycle (réveil anticipé sur événement marché)
+                await self._wait_next_cycle()
                 
             except KeyboardInterrupt:
                 self.logger.info("🛑 Arrêt demandé par l'utilisateur")
                 break
             except Exception as e:
-                self.logger.error(f"❌ Erreur dans la boucle principale: {e}")
-                self.logger.error(traceback.format_exc())
+                self.logger.error(f"❌ Erreur dans la boucle principale: {e}", exc_info=True)
                 
-                # Notification d'erreur
+                # Notification d'erreur regroupée avec les messages en attente de cette itération,
+                # envoyée avant l'attente de reprise
                 try:
                     if self.telegram_notifier:
-                        await self.telegram_notifier.send_error_notification(str(e), "Boucle principale")
+                        await self.telegram_notifier.send_error_notification(
+                            {'component': 'Boucle principale', 'message': str(e)}, defer=True
+                        )
+                        await self.telegram_notifier.flush_messages()
                 except:
                     self.logger.error("❌ Impossible d'envoyer la notification d'erreur")
                 
-                # Réinitialisation des connexions en cas d'erreur réseau
-                try:
-                    if "timeout" in str(e).lower() or "connection" in str(e).lower():
-                        self.logger.warning("🔄 Reconnexion après erreur réseau...")
-                        await self.data_fetcher.test_connection()
-                except:
+                # Erreur réseau: reconnexion avec attentes croissantes, reprise dès que l'API répond
+                error_text = str(e).lower()
+                if "timeout" in error_text or "connection" in error_text:
+                    self.logger.warning("🔄 Reconnexion après erreur réseau...")
+                    if await self._reconnect_with_backoff():
+                        continue
                     self.logger.error("❌ Échec de la reconnexion")
                 
                 # Attendre avant de continuer
                 await asyncio.sleep(60)
     
+    async def _reconnect_with_backoff(self) -> bool:
+        """Reteste la connexion Binance après chaque attente de RECONNECT_BACKOFF_SECONDS
+        
+        Returns:
+            True dès qu'un test réussit, False si tous échouent
+        """
+        for delay in self.RECONNECT_BACKOFF_SECONDS:
+            await asyncio.sleep(delay)
+            try:
+                if await self.data_fetcher.test_connection():
+                    return True
+            except Exception:
+                continue
+        return False
+    
     async def shutdown(self):
         """Arrêt propre du bot"""
         self.logger.info("🛑 Arrêt du bot en cours...")
@@ -945,8 +1332,21 @@ class RSIScalpingBot:
         for pair in list(self.open_positions.keys()):
             await self.close_position(pair, "Arrêt du bot")
         
-        # Notification de fin
+        # Arrêt de l'écriture en arrière-plan puis sauvegarde finale systématique: une écriture
+        # annulée en cours de route a déjà consommé le drapeau _state_dirty
+        if self._state_writer_task:
+            self._state_writer_task.cancel()
+            try:
+                await self._state_writer_task
+            except asyncio.CancelledError:
+                pass
+            self._state_writer_task = None
+        self._state_dirty.clear()
+        await self.save_state()
+        
+        # Notification de fin (précédée des notifications encore en attente)
         if self.telegram_notifier:
+            await self.telegram_notifier.flush_messages()
             # Récupérer les vraies statistiques depuis Firebase
             daily_stats = await self.get_daily_stats_from_firebase()
             
@@ -960,7 +1360,13 @@ class RSIScalpingBot:
             }
             await self.telegram_notifier.send_daily_summary(summary_data)
         
+        # Logs de trades encore en cours d'envoi
+        if self.trade_executor:
+            await self.trade_executor.wait_background_tasks()
+        
         # Fermeture des connexions
+        if self.telegram_notifier:
+            await self.telegram_notifier.close()
         if self.data_fetcher and hasattr(self.data_fetcher, 'close'):
             await self.data_fetcher.close()
         
@@ -973,8 +1379,7 @@ class RSIScalpingBot:
             await self.initialize_modules()
             await self.main_loop()
         except Exception as e:
-            self.logger.error(f"❌ Erreur critique: {e}")
-            self.logger.error(traceback.format_exc())
+            self.logger.error(f"❌ Erreur critique: {e}", exc_info=True)
         finally:
             await self.shutdown()
 
@@ -995,9 +1400,8 @@ async def main():
 
 
 if __name__ == "__main__":
-    # Configuration pour Windows
-    if sys.platform == "win32":
-        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+    # Proactor sous Windows, uvloop ailleurs si installé
+    setup_event_loop_policy()
     
     try:
         asyncio.run(main())
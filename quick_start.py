@@ -4,6 +4,7 @@
 Script de démarrage rapide et de vérification
 """
 
+import asyncio
 import sys
 import os
 import subprocess
@@ -11,6 +12,24 @@ import time
 import platform
 from pathlib import Path
 
+# Contenu des fichiers .env déjà lus: chemin -> (date de modification, contenu)
+_env_cache = {}
+
+def _read_env_file(env_file):
+    """Retourne le contenu de .env (None s'il est absent), relu seulement s'il a été modifié"""
+    try:
+        mtime = env_file.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    
+    cached = _env_cache.get(env_file)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    content = env_file.read_text()
+    _env_cache[env_file] = (mtime, content)
+    return content
+
 def print_banner():
     """Affiche la bannière du bot"""
     banner = """
@@ -60,31 +79,36 @@ def check_environment():
     print("✅ Fichiers essentiels présents")
     return True
 
-def install_dependencies():
-    """Installe les dépendances"""
+async def install_dependencies():
+    """Installe les dépendances (pip en tâche de fond, sans bloquer les questions suivantes)"""
     print("📦 Installation des dépendances...")
     
     try:
-        result = subprocess.run([
-            sys.executable, "-m", "pip", "install", "-r", "requirements_bot.txt"
-        ], capture_output=True, text=True, timeout=300)
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "pip", "install", "-r", "requirements_bot.txt",
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        try:
+            _, stderr = await asyncio.wait_for(process.communicate(), timeout=300)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            print("❌ Timeout lors de l'installation des dépendances")
+            return False
         
-        if result.returncode == 0:
+        if process.returncode == 0:
             print("✅ Dépendances installées avec succès")
             return True
         else:
             print("❌ Erreur installation dépendances:")
-            print(result.stderr)
+            print(stderr.decode(errors='replace'))
             return False
             
-    except subprocess.TimeoutExpired:
-        print("❌ Timeout lors de l'installation des dépendances")
-        return False
     except Exception as e:
         print(f"❌ Erreur: {e}")
         return False
 
-def check_config():
+async def check_config():
     """Vérifie la configuration"""
     env_file = Path(".env")
     env_example = Path(".env.example")
@@ -94,7 +118,7 @@ def check_config():
             print("⚠️ Fichier .env manquant")
             print("💡 Copiez .env.example vers .env et configurez vos clés API")
             
-            response = input("Voulez-vous copier .env.example vers .env maintenant? (y/n): ")
+            response = await asyncio.to_thread(input, "Voulez-vous copier .env.example vers .env maintenant? (y/n): ")
             if response.lower() in ['y', 'yes', 'o', 'oui']:
                 try:
                     import shutil
@@ -119,19 +143,24 @@ def run_validation():
     print("🧪 Validation du système...")
     
     try:
-        result = subprocess.run([
-            sys.executable, "test_validation.py"
-        ], capture_output=True, text=True, timeout=60)
-        
-        print(result.stdout)
-        if result.stderr:
-            print(result.stderr)
+        # Dans ce processus; rechargé seulement s'il a déjà été importé (relance de tous les tests)
+        import importlib
+        if 'test_validation' in sys.modules:
+            test_validation = importlib.reload(sys.modules['test_validation'])
+        else:
+            import test_validation
         
-        return result.returncode == 0
+        # Code retour (0) ou booléen selon le script
+        result = test_validation.main()
+        return result in (None, True, 0)
         
-    except FileNotFoundError:
-        print("⚠️ Script de validation non trouvé (optionnel)")
-        return True
+    except ModuleNotFoundError as e:
+        if e.name == 'test_validation':
+            print("⚠️ Script de validation non trouvé (optionnel)")
+            return True
+        # Dépendance manquante importée par le script de validation: vrai échec
+        print(f"❌ Validation impossible, module manquant: {e.name}")
+        return False
     except Exception as e:
         print(f"⚠️ Erreur validation: {e}")
         return True  # Continue même si validation échoue
@@ -167,11 +196,13 @@ def launch_trading_bot():
     print("-" * 40)
     
     try:
-        subprocess.run([sys.executable, "main.py"])
+        # Dans ce processus: pas de nouvel interpréteur ni de réimport de pandas/ccxt/talib
+        from main import main as bot_main
+        asyncio.run(bot_main())
     except KeyboardInterrupt:
         print("\n⏹️ Bot arrêté par l'utilisateur")
-    except FileNotFoundError:
-        print("❌ Fichier main.py non trouvé")
+    except ImportError as e:
+        print(f"❌ Impossible de charger main.py: {e}")
     except Exception as e:
         print(f"❌ Erreur lancement bot: {e}")
 
@@ -216,9 +247,8 @@ def show_config():
         print(f"Timeframe: {trading_config.TIMEFRAME}")
         
         # Vérification clés API (sans les afficher)
-        env_file = Path(".env")
-        if env_file.exists():
-            content = env_file.read_text()
+        content = _read_env_file(Path(".env"))
+        if content is not None:
             has_binance = "BINANCE_API_KEY=" in content and "your_" not in content
             has_telegram = "TELEGRAM_BOT_TOKEN=" in content and "your_" not in content
             
@@ -280,34 +310,47 @@ def show_help():
     """
     print(help_text)
 
-def main():
-    """Fonction principale"""
-    print_banner()
-    
-    # Vérifications préliminaires
-    if not check_python_version():
-        sys.exit(1)
-    
-    if not check_environment():
-        sys.exit(1)
+async def prepare():
+    """Installation, configuration et validation
     
+    pip tourne en tâche de fond pendant les questions sur la configuration; la validation,
+    qui importe les dépendances, attend la fin de l'installation.
+    """
     # Demander si installer les dépendances
-    response = input("\n📦 Installer/Mettre à jour les dépendances? (y/n): ")
+    install_task = None
+    response = await asyncio.to_thread(input, "\n📦 Installer/Mettre à jour les dépendances? (y/n): ")
     if response.lower() in ['y', 'yes', 'o', 'oui']:
-        if not install_dependencies():
-            print("❌ Échec installation dépendances")
-            sys.exit(1)
+        install_task = asyncio.create_task(install_dependencies())
     
     # Vérifier la configuration
-    if not check_config():
+    if not await check_config():
         print("\n⚠️ Configuration incomplète. Configurez .env avant de continuer.")
-        input("Appuyez sur Entrée une fois la configuration terminée...")
+        await asyncio.to_thread(input, "Appuyez sur Entrée une fois la configuration terminée...")
     
     # Validation optionnelle
-    response = input("\n🧪 Lancer la validation du système? (y/n): ")
+    response = await asyncio.to_thread(input, "\n🧪 Lancer la validation du système? (y/n): ")
+    
+    if install_task and not await install_task:
+        print("❌ Échec installation dépendances")
+        sys.exit(1)
+    
     if response.lower() in ['y', 'yes', 'o', 'oui']:
         if not run_validation():
             print("⚠️ Validation échouée. Vous pouvez continuer mais des erreurs sont possibles.")
+
+def main():
+    """Fonction principale"""
+    print_banner()
+    
+    # Vérifications préliminaires
+    if not check_python_version():
+        sys.exit(1)
+    
+    if not check_environment():
+        sys.exit(1)
+    
+    # Boucle asyncio limitée à la préparation: le menu lance ensuite le bot avec son propre asyncio.run
+    asyncio.run(prepare())
     
     # Menu principal
     while True:
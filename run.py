@@ -18,6 +18,7 @@ load_dotenv()
 
 from config import validate_config, print_config_summary
 from main import RSIScalpingBot
+from utils import setup_event_loop_policy
 
 
 def main():
@@ -46,6 +47,9 @@ def main():
     # Création et lancement du bot
     bot = RSIScalpingBot()
     
+    # Proactor sous Windows, uvloop ailleurs si installé
+    setup_event_loop_policy()
+    
     try:
         print("🚀 Lancement du RSI Scalping Pro Bot...")
         asyncio.run(bot.run())
@@ -14,11 +14,11 @@ def main():
     
     # Import et lancement du service principal
     from binance_live_service import main as binance_main
+    from utils import setup_event_loop_policy
     import asyncio
     
-    # Configuration pour Windows (si nécessaire)
-    if sys.platform == "win32":
-        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+    # Proactor sous Windows, uvloop ailleurs si installé
+    setup_event_loop_policy()
     
     return asyncio.run(binance_main())
 
@@ -8,6 +8,7 @@ import argparse
 import asyncio
 import logging
 import os
+import random
 import signal
 import sys
 import time
@@ -16,15 +17,24 @@ from pathlib import Path
 # Ajouter le répertoire parent au PATH
 sys.path.append(str(Path(__file__).parent.parent))
 
+from binance.exceptions import BinanceAPIException
 from binance_live_service import BinanceLiveService
+from utils import setup_event_loop_policy
 
 
 class BinanceLiveManager:
     """Gestionnaire du service Binance Live avec restart automatique"""
     
+    # Codes Binance de clé API invalide / signature refusée: un redémarrage n'y changera rien
+    AUTH_ERROR_CODES = (-1022, -2014, -2015)
+    
+    # Durée de fonctionnement au-delà de laquelle le service est considéré rétabli (backoff réinitialisé)
+    HEALTHY_RUN_SECONDS = 300
+    
     def __init__(self, max_retries: int = 5, retry_delay: int = 30):
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self._sleep = retry_delay  # Dernière attente (backoff à jitter décorrélé)
         self.service = None
         self.should_restart = True
         self.setup_logging()
@@ -78,6 +88,7 @@ class BinanceLiveManager:
                 self.logger.info(f"🚀 Démarrage service (tentative {retry_count + 1}/{self.max_retries})")
                 
                 # Créer nouvelle instance
+                started_at = time.monotonic()
                 self.service = BinanceLiveService()
                 
                 # Démarrer
@@ -87,18 +98,39 @@ class BinanceLiveManager:
                 break
                 
             except Exception as e:
+                if isinstance(e, BinanceAPIException) and e.code in self.AUTH_ERROR_CODES:
+                    self.logger.error(f"💀 Erreur d'authentification Binance, abandon sans retry: {e}")
+                    break
+                
+                # Panne après une longue période de bon fonctionnement: le backoff repart du délai de base
+                if time.monotonic() - started_at >= self.HEALTHY_RUN_SECONDS:
+                    self._sleep = self.retry_delay
+                
                 retry_count += 1
                 self.logger.error(f"❌ Erreur service (tentative {retry_count}): {e}")
-                
-                if retry_count < self.max_retries and self.should_restart:
-                    self.logger.info(f"⏳ Retry dans {self.retry_delay} secondes...")
-                    await asyncio.sleep(self.retry_delay)
-                else:
-                    self.logger.error("💀 Nombre maximum de tentatives atteint")
+                if not await self._wait_before_retry(retry_count):
                     break
         
         self.logger.info("🔚 Manager arrêté")
+    
+    async def _wait_before_retry(self, retry_count: int) -> bool:
+        """Attente avant redémarrage, backoff à jitter décorrélé
+        
+        Tirage entre retry_delay et 3x l'attente précédente (plafonné à 10x retry_delay), pour que
+        plusieurs instances relancées ensemble ne se reconnectent pas au même instant.
+        
+        Returns:
+            False si plus aucune tentative n'est permise
+        """
+        if retry_count < self.max_retries and self.should_restart:
+            self._sleep = min(self.retry_delay * 10, random.uniform(self.retry_delay, self._sleep * 3))
+            self.logger.info(f"⏳ Retry dans {self._sleep:.0f} secondes...")
+            await asyncio.sleep(self._sleep)
+            return True
         
+        self.logger.error("💀 Nombre maximum de tentatives atteint")
+        return False
+    
     async def start(self):
         """Démarrage du gestionnaire"""
         self.setup_signal_handlers()
@@ -230,5 +262,8 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Proactor sous Windows, uvloop ailleurs si installé
+    setup_event_loop_policy()
+    
     exit_code = asyncio.run(main())
     exit(exit_code)
@@ -5,17 +5,13 @@ Interface de monitoring et contrôle en temps réel
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import asyncio
 import sys
 import os
-from datetime import datetime, timedelta
-from streamlit_autorefresh import st_autorefresh
+from datetime import datetime, timedelta, timezone
 import json
-import time
 
 # Configuration de la page
 st.set_page_config(
@@ -29,6 +25,8 @@ st.set_page_config(
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 try:
+    import firebase_admin
+    from firebase_admin import credentials, firestore
     from config import TradingConfig, APIConfig
     from firebase_logger import FirebaseLogger
     from data_fetcher import DataFetcher
@@ -36,6 +34,96 @@ except ImportError as e:
     st.error(f"❌ Erreur import modules: {e}")
     st.stop()
 
+@st.cache_resource(show_spinner=False)
+def get_firestore_client():
+    """Client Firestore unique pour le serveur Streamlit (canal gRPC conservé entre les reruns)"""
+    try:
+        app = firebase_admin.get_app()
+        return firestore.client(app)
+    except ValueError:
+        cred_paths = [
+            '/opt/satochi_bot/firebase-credentials.json',
+            'firebase-credentials.json',
+            '../firebase-credentials.json'
+        ]
+        
+        for path in cred_paths:
+            if os.path.exists(path):
+                cred = credentials.Certificate(path)
+                app = firebase_admin.initialize_app(cred)
+                return firestore.client(app)
+        
+        return None
+
+
+@st.cache_data(ttl=25, show_spinner=False)
+def get_binance_live_doc(doc_name: str) -> dict:
+    """Document de la collection binance_live, relu dans Firestore au plus toutes les 25s
+    
+    Les reruns (auto-refresh 30s, clics) et les widgets qui lisent le même document
+    partagent une seule lecture.
+    """
+    db = get_firestore_client()
+    if db is None:
+        return {}
+    doc = db.collection('binance_live').document(doc_name).get()
+    return doc.to_dict() if doc.exists else {}
+
+
+@st.cache_data(ttl=25, show_spinner=False)
+def get_binance_live_docs(doc_names: tuple) -> dict:
+    """Plusieurs documents binance_live lus en un seul appel Firestore (get_all), cache 25s
+    
+    Returns:
+        {nom du document: contenu} ({} pour un document absent)
+    """
+    db = get_firestore_client()
+    if db is None:
+        return {name: {} for name in doc_names}
+    collection = db.collection('binance_live')
+    docs = {name: {} for name in doc_names}
+    for doc in db.get_all([collection.document(name) for name in doc_names]):
+        if doc.exists:
+            docs[doc.id] = doc.to_dict()
+    return docs
+
+
+@st.cache_data(ttl=25, show_spinner=False)
+def get_rolling_stats(day: str) -> dict:
+    """Agrégats du jour tenus à jour par le bot à chaque clôture (un seul document), cache 25s"""
+    db = get_firestore_client()
+    if db is None:
+        return {}
+    doc = db.collection('rsi_scalping_rolling_stats').document(day).get()
+    return doc.to_dict() if doc.exists else {}
+
+
+def parse_iso_timestamp(value: str) -> datetime:
+    """Horodatage ISO du service binance_live, toujours avec fuseau
+    
+    Le service écrit des horodatages naïfs en heure locale: ils sont convertis en
+    datetime avec fuseau pour pouvoir être comparés à datetime.now(timezone.utc).
+    """
+    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return dt.astimezone() if dt.tzinfo is None else dt
+
+
+@st.cache_resource(show_spinner=False)
+def get_connections():
+    """FirebaseLogger et DataFetcher uniques pour le serveur Streamlit
+    
+    Le client Binance (ping + handshake TLS à la construction) n'est plus recréé à chaque rerun.
+    """
+    api_config = APIConfig()
+    firebase_logger = FirebaseLogger(api_config.FIREBASE_CREDENTIALS)
+    data_fetcher = DataFetcher(
+        api_key=api_config.BINANCE_API_KEY,
+        secret_key=api_config.BINANCE_SECRET_KEY,
+        testnet=api_config.BINANCE_TESTNET
+    )
+    return firebase_logger, data_fetcher
+
+
 class SatochiDashboard:
     """Dashboard principal du bot Satochi"""
     
@@ -51,15 +139,8 @@ class SatochiDashboard:
     def _init_connections(self):
         """Initialise les connexions Firebase et API"""
         try:
-            # Firebase
-            self.firebase_logger = FirebaseLogger()
-            
-            # Data Fetcher
-            self.data_fetcher = DataFetcher(
-                api_key=self.api_config.BINANCE_API_KEY,
-                api_secret=self.api_config.BINANCE_SECRET_KEY,
-                testnet=self.api_config.BINANCE_TESTNET
-            )
+            # Firebase et Data Fetcher partagés entre les reruns
+            self.firebase_logger, self.data_fetcher = get_connections()
             
         except Exception as e:
             st.error(f"❌ Erreur initialisation connexions: {e}")
@@ -67,8 +148,11 @@ class SatochiDashboard:
     def run(self):
         """Lance l'interface dashboard"""
         
-        # Auto-refresh toutes les 30 secondes
-        st_autorefresh(interval=30000, key="dashboard_refresh")
+        # Rafraîchissement par fragments: seuls les blocs alimentés par Firebase sont réexécutés
+        # (statut 10s, métriques 30s), pas les graphiques ni le reste de la page
+        auto_refresh = st.session_state.get('auto_refresh', True)
+        status_refresh = "10s" if auto_refresh else None
+        metrics_refresh = "30s" if auto_refresh else None
         
         # Sidebar avec logo et contrôles
         with st.sidebar:
@@ -77,16 +161,7 @@ class SatochiDashboard:
             st.markdown("---")
             
             # Statut du bot
-            bot_status = self._get_bot_status()
-            if bot_status['is_running']:
-                st.success("🟢 Bot actif")
-                st.metric("⏱️ Uptime", bot_status['uptime'])
-                if 'cycle_count' in bot_status:
-                    st.metric("🔄 Cycles", bot_status['cycle_count'])
-                if 'monitored_pairs' in bot_status:
-                    st.metric("📊 Paires", bot_status['monitored_pairs'])
-            else:
-                st.error("🔴 Bot arrêté")
+            st.fragment(self._display_bot_status, run_every=status_refresh)()
             
             # Contrôles
             st.subheader("⚙️ Contrôles")
@@ -105,17 +180,13 @@ class SatochiDashboard:
             # Paramètres temps réel
             st.markdown("---")
             st.subheader("📊 Données")
-            auto_refresh = st.checkbox("Auto-refresh (30s)", value=True)
-            
-            if auto_refresh:
-                time.sleep(30)
-                st.rerun()
+            st.checkbox("Auto-refresh (30s)", value=True, key='auto_refresh')
         
         # Corps principal
         st.title("📊 Satochi Bot - RSI Scalping Pro Dashboard")
         
         # Métriques principales
-        self._display_main_metrics()
+        st.fragment(self._display_main_metrics, run_every=metrics_refresh)()
         
         # Graphiques principaux
         col1, col2 = st.columns(2)
@@ -134,18 +205,30 @@ class SatochiDashboard:
         st.subheader("📋 Derniers Trades")
         self._display_recent_trades()
     
+    def _display_bot_status(self):
+        """Affiche le statut du bot (fragment de la sidebar)"""
+        bot_status = self._get_bot_status()
+        if bot_status['is_running']:
+            st.success("🟢 Bot actif")
+            st.metric("⏱️ Uptime", bot_status['uptime'])
+            if 'cycle_count' in bot_status:
+                st.metric("🔄 Cycles", bot_status['cycle_count'])
+            if 'monitored_pairs' in bot_status:
+                st.metric("📊 Paires", bot_status['monitored_pairs'])
+        else:
+            st.error("🔴 Bot arrêté")
+    
     def _get_bot_status(self):
         """Récupère le statut du bot depuis Firebase"""
         try:
             # Récupérer le health check du binance live service
-            health_doc = self.db.collection('binance_live').document('health').get()
+            health_data = get_binance_live_doc('health')
             
-            if health_doc.exists:
-                health_data = health_doc.to_dict()
+            if health_data:
                 last_update = health_data.get('timestamp')
                 if last_update:
-                    last_update_dt = datetime.fromisoformat(last_update.replace('Z', '+00:00'))
-                    uptime_seconds = (datetime.now() - last_update_dt).total_seconds()
+                    last_update_dt = parse_iso_timestamp(last_update)
+                    uptime_seconds = (datetime.now(timezone.utc) - last_update_dt).total_seconds()
                     
                     if uptime_seconds < 300:  # Moins de 5 minutes = actif
                         hours = int(uptime_seconds // 3600)
@@ -230,40 +313,36 @@ class SatochiDashboard:
     def _get_daily_stats(self):
         """Récupère les statistiques quotidiennes depuis Firebase"""
         try:
-            # Récupérer les données de compte Binance
-            account_doc = self.db.collection('binance_live').document('account_info').get()
-            account_data = account_doc.to_dict() if account_doc.exists else {}
-            
-            # Récupérer les trades récents
-            trades_doc = self.db.collection('binance_live').document('recent_trades').get()
-            trades_data = trades_doc.to_dict() if trades_doc.exists else {}
+            # Compte Binance, trades récents et ordres ouverts en un seul aller-retour Firestore
+            docs = get_binance_live_docs(('account_info', 'recent_trades', 'open_orders'))
+            account_data = docs['account_info']
+            trades_data = docs['recent_trades']
             
             # Calculer les statistiques
             total_capital = account_data.get('total_value_usdc_approx', 0)
             daily_trades = len(trades_data.get('trades', []))
             
-            # Calculer P&L et winrate depuis les trades
+            # Calculer P&L et winrate depuis les trades (approximation: achats négatifs,
+            # ventes positives), réductions numpy vectorisées
             trades = trades_data.get('trades', [])
-            daily_pnl = 0
-            winning_trades = 0
-            
-            for trade in trades:
-                # Calculer approximatif du P&L (simplification)
-                if trade.get('isBuyer'):
-                    # Achat - on considère comme négatif pour le calcul
-                    daily_pnl -= trade.get('quoteQty', 0)
-                else:
-                    # Vente - positif
-                    daily_pnl += trade.get('quoteQty', 0)
-                    if trade.get('quoteQty', 0) > 0:
-                        winning_trades += 1
+            quote_qty = np.fromiter((trade.get('quoteQty', 0) for trade in trades), dtype=np.float64, count=len(trades))
+            is_buyer = np.fromiter((bool(trade.get('isBuyer')) for trade in trades), dtype=bool, count=len(trades))
+            pnl = np.where(is_buyer, -quote_qty, quote_qty)
+            daily_pnl = float(np.sum(pnl))
+            winning_trades = int(np.count_nonzero(pnl > 0))
+            
+            # Agrégats pré-calculés par le bot: P&L réel des trades clôturés du jour
+            rolling = get_rolling_stats(datetime.now(timezone.utc).strftime('%Y-%m-%d'))
+            if rolling.get('total_trades'):
+                daily_trades = int(rolling['total_trades'])
+                winning_trades = int(rolling.get('winning_trades', 0))
+                daily_pnl = float(rolling.get('total_pnl', 0.0))
             
             winrate = (winning_trades / daily_trades * 100) if daily_trades > 0 else 0
             daily_pnl_percent = (daily_pnl / total_capital * 100) if total_capital > 0 else 0
             
             # Récupérer positions ouvertes
-            orders_doc = self.db.collection('binance_live').document('open_orders').get()
-            orders_data = orders_doc.to_dict() if orders_doc.exists else {}
+            orders_data = docs['open_orders']
             active_positions = len(orders_data.get('orders', []))
             
             return {
@@ -295,48 +374,78 @@ class SatochiDashboard:
                 'daily_pnl': [(i % 3 - 1) * 15 + 5 for i in range(30)]
             })
             
-            fig = make_subplots(
-                rows=2, cols=1,
-                subplot_titles=('P&L Cumulé', 'P&L Journalier'),
-                vertical_spacing=0.1
-            )
-            
-            # P&L Cumulé
-            fig.add_trace(
-                go.Scatter(
-                    x=pnl_data['date'],
-                    y=pnl_data['pnl_cumul'],
-                    mode='lines+markers',
-                    name='P&L Cumulé',
-                    line=dict(color='#00ff88', width=2)
-                ),
-                row=1, col=1
-            )
+            # Squelette de figure construit une seule fois par session: seuls x/y changent ensuite
+            fig = st.session_state.get('pnl_fig')
+            if fig is None:
+                fig = self._build_pnl_figure()
+                st.session_state['pnl_fig'] = fig
             
-            # P&L Journalier
-            colors = ['#ff4444' if x < 0 else '#00ff88' for x in pnl_data['daily_pnl']]
-            fig.add_trace(
-                go.Bar(
-                    x=pnl_data['date'],
-                    y=pnl_data['daily_pnl'],
-                    name='P&L Journalier',
-                    marker_color=colors
-                ),
-                row=2, col=1
-            )
-            
-            fig.update_layout(
-                height=400,
-                showlegend=False,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)'
-            )
+            fig.data[0].x = pnl_data['date']
+            fig.data[0].y = pnl_data['pnl_cumul']
+            fig.data[1].x = pnl_data['date']
+            fig.data[1].y = pnl_data['daily_pnl']
+            fig.data[1].marker.color = np.where(pnl_data['daily_pnl'] < 0, '#ff4444', '#00ff88')
             
             st.plotly_chart(fig, use_container_width=True)
             
         except Exception as e:
             st.error(f"❌ Erreur graphique P&L: {e}")
     
+    @staticmethod
+    def _build_pnl_figure():
+        """Figure P&L vide (cumulé + journalier), alimentée à chaque rerun"""
+        # Import différé: plotly n'est chargé qu'à la première construction de figure
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+        
+        fig = make_subplots(
+            rows=2, cols=1,
+            subplot_titles=('P&L Cumulé', 'P&L Journalier'),
+            vertical_spacing=0.1
+        )
+        
+        # P&L Cumulé (WebGL: la courbe grandit avec l'historique des trades)
+        fig.add_trace(
+            go.Scattergl(
+                x=[], y=[],
+                mode='lines+markers',
+                name='P&L Cumulé',
+                line=dict(color='#00ff88', width=2)
+            ),
+            row=1, col=1
+        )
+        
+        # P&L Journalier
+        fig.add_trace(
+            go.Bar(x=[], y=[], name='P&L Journalier'),
+            row=2, col=1
+        )
+        
+        fig.update_layout(
+            height=400,
+            showlegend=False,
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)'
+        )
+        return fig
+    
+    @staticmethod
+    def _build_positions_figure():
+        """Camembert d'exposition vide, alimenté à chaque rerun"""
+        import plotly.graph_objects as go
+        
+        fig = go.Figure(go.Pie(
+            values=[], labels=[],
+            marker=dict(colors=['#ff6b6b', '#4ecdc4', '#45b7d1'])
+        ))
+        fig.update_layout(
+            title="Exposition par paire",
+            height=300,
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)'
+        )
+        return fig
+    
     def _display_positions_overview(self):
         """Affiche l'aperçu des positions"""
         st.subheader("🎯 Répartition Positions")
@@ -351,19 +460,18 @@ class SatochiDashboard:
             
             df = pd.DataFrame(positions_data)
             
-            # Graphique en secteurs
-            fig = px.pie(
-                values=[abs(x) for x in df['P&L']],
-                names=df['Paire'],
-                title="Exposition par paire",
-                color_discrete_sequence=['#ff6b6b', '#4ecdc4', '#45b7d1']
-            )
+            # Graphique en secteurs (figure réutilisée d'un rerun à l'autre)
+            fig = st.session_state.get('positions_fig')
+            if fig is None:
+                fig = self._build_positions_figure()
+                st.session_state['positions_fig'] = fig
             
-            fig.update_layout(
-                height=300,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)'
-            )
+            # Positions identiques au rerun précédent: la figure en session est rejouée telle quelle
+            positions_key = hash(tuple(zip(positions_data['Paire'], positions_data['P&L'])))
+            if positions_key != st.session_state.get('positions_key'):
+                fig.data[0].values = df['P&L'].abs()
+                fig.data[0].labels = df['Paire']
+                st.session_state['positions_key'] = positions_key
             
             st.plotly_chart(fig, use_container_width=True)
             
@@ -389,16 +497,18 @@ class SatochiDashboard:
                 'TP': [46789.12, 2678.90, 0.4789]
             })
             
-            # Colorisation des P&L
-            def color_pnl(val):
-                if isinstance(val, (int, float)):
-                    color = 'color: green' if val > 0 else 'color: red' if val < 0 else 'color: gray'
-                    return color
-                return ''
-            
-            styled_df = positions.style.applymap(color_pnl, subset=['P&L USDC', 'P&L %'])
-            
-            st.dataframe(styled_df, use_container_width=True)
+            # Indicateur de P&L calculé en une passe vectorisée (pas de Styler évalué cellule par cellule)
+            pnl = positions['P&L USDC'].to_numpy()
+            positions.insert(0, 'État', np.where(pnl > 0, '🟢', np.where(pnl < 0, '🔴', '⚪')))
+            
+            st.dataframe(
+                positions,
+                use_container_width=True,
+                column_config={
+                    'P&L USDC': st.column_config.NumberColumn(format='%+.2f'),
+                    'P&L %': st.column_config.NumberColumn(format='%+.2f%%')
+                }
+            )
             
         except Exception as e:
             st.error(f"❌ Erreur positions actives: {e}")
@@ -425,21 +535,16 @@ class SatochiDashboard:
                 'Exit Reason': ['TP', 'SL', '-', 'TP', '-']
             })
             
-            # Colorisation
-            def color_trades(row):
-                if row['Type'] == 'BUY':
-                    return ['background-color: rgba(0,255,136,0.1)'] * len(row)
-                elif row['P&L USDC'] != '-':
-                    pnl = float(row['P&L USDC']) if row['P&L USDC'] != '-' else 0
-                    if pnl > 0:
-                        return ['background-color: rgba(0,255,136,0.1)'] * len(row)
-                    else:
-                        return ['background-color: rgba(255,68,68,0.1)'] * len(row)
-                return [''] * len(row)
-            
-            styled_trades = trades.style.apply(color_trades, axis=1)
-            
-            st.dataframe(styled_trades, use_container_width=True)
+            # Indicateur par ligne (achat ou vente gagnante en vert, vente perdante en rouge),
+            # calculé en vectorisé à la place du Styler ligne par ligne
+            pnl = pd.to_numeric(trades['P&L USDC'], errors='coerce')
+            trades.insert(0, 'État', np.select(
+                [trades['Type'] == 'BUY', pnl > 0, pnl.notna()],
+                ['🟢', '🟢', '🔴'],
+                default=''
+            ))
+            
+            st.dataframe(trades, use_container_width=True)
             
         except Exception as e:
             st.error(f"❌ Erreur derniers trades: {e}")
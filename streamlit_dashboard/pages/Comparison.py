@@ -11,8 +11,10 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import json
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # Ajouter le répertoire parent au path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
@@ -25,6 +27,24 @@ except ImportError as e:
     st.stop()
 
 
+# Colonnes affichées par tableau
+BINANCE_TRADE_COLUMNS = ('symbol', 'price', 'qty', 'time', 'isBuyer')
+BOT_TRADE_COLUMNS = ('pair', 'side', 'price', 'quantity', 'status')
+ORDER_COLUMNS = ('symbol', 'side', 'type', 'price', 'origQty', 'status')
+BALANCE_COLUMNS = ('asset', 'free', 'locked', 'total')
+
+
+def present_columns(records, display_columns) -> list:
+    """Colonnes affichées présentes dans au moins un enregistrement (ordre d'affichage conservé)"""
+    keys = set().union(*records)
+    return [col for col in display_columns if col in keys]
+
+
+def records_to_frame(records, columns) -> pd.DataFrame:
+    """DataFrame limité aux colonnes affichées, en dtypes Arrow (sérialisation st.dataframe sans conversion objet)"""
+    return pd.DataFrame.from_records(records, columns=columns).convert_dtypes(dtype_backend='pyarrow')
+
+
 class BinanceFirebaseComparison:
     """Classe pour comparer les données Binance/Firebase"""
     
@@ -49,21 +69,14 @@ class BinanceFirebaseComparison:
             if not self.firebase_logger or not self.firebase_logger.db:
                 return None, None, None, None
             
-            # Account info
-            account_doc = self.firebase_logger.db.collection('binance_live').document('account_info').get()
-            account_data = account_doc.to_dict() if account_doc.exists else None
-            
-            # Recent trades
-            trades_doc = self.firebase_logger.db.collection('binance_live').document('recent_trades').get()
-            trades_data = trades_doc.to_dict() if trades_doc.exists else None
-            
-            # Open orders
-            orders_doc = self.firebase_logger.db.collection('binance_live').document('open_orders').get()
-            orders_data = orders_doc.to_dict() if orders_doc.exists else None
-            
-            # Health status
-            health_doc = self.firebase_logger.db.collection('binance_live').document('health').get()
-            health_data = health_doc.to_dict() if health_doc.exists else None
+            # Compte, trades récents, ordres ouverts et santé du service en un seul get_all
+            collection = self.firebase_logger.db.collection('binance_live')
+            doc_names = ('account_info', 'recent_trades', 'open_orders', 'health')
+            docs = dict.fromkeys(doc_names)
+            for doc in self.firebase_logger.db.get_all([collection.document(name) for name in doc_names]):
+                if doc.exists:
+                    docs[doc.id] = doc.to_dict()
+            account_data, trades_data, orders_data, health_data = (docs[name] for name in doc_names)
             
             return account_data, trades_data, orders_data, health_data
             
@@ -94,6 +107,17 @@ class BinanceFirebaseComparison:
             st.error(f"❌ Erreur récupération trades bot: {e}")
             return []
     
+    def fetch_page_data(self):
+        """Lit binance_live et les trades du bot en parallèle (deux lectures Firestore indépendantes)
+        
+        Les threads reçoivent le contexte du script pour que st.error reste affiché en cas d'erreur.
+        """
+        ctx = get_script_run_ctx()
+        with ThreadPoolExecutor(max_workers=2, initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+            live_future = executor.submit(self.get_binance_live_data)
+            trades_future = executor.submit(self.get_bot_trades_data)
+            return live_future.result(), trades_future.result()
+    
     def display_service_status(self, health_data):
         """Affiche le statut du service binance-live"""
         st.subheader("🔍 Statut du Service Binance Live")
@@ -150,12 +174,14 @@ class BinanceFirebaseComparison:
             
             balances = account_data.get('balances', [])
             if balances:
-                df_binance = pd.DataFrame(balances)
-                df_binance = df_binance[df_binance['total'] > 0].sort_values('total', ascending=False)
+                # Seules les colonnes affichées sont chargées dans le DataFrame
+                df_binance = records_to_frame(balances, present_columns(balances, BALANCE_COLUMNS))
+                if 'total' in df_binance.columns:
+                    df_binance = df_binance[df_binance['total'] > 0].sort_values('total', ascending=False)
                 
                 # Affichage des principales balances
                 st.dataframe(
-                    df_binance[['asset', 'free', 'locked', 'total']],
+                    df_binance,
                     use_container_width=True,
                     height=300
                 )
@@ -204,14 +230,14 @@ class BinanceFirebaseComparison:
                 col1b.metric("🟢 Achats", buy_trades)
                 col1c.metric("🔴 Ventes", sell_trades)
                 
-                # DataFrame des trades récents
+                # DataFrame des trades récents (20 derniers), limité aux colonnes affichées
                 if binance_trades:
-                    df_binance_trades = pd.DataFrame(binance_trades[:20])  # 20 derniers
+                    recent_trades = binance_trades[:20]
+                    available_cols = present_columns(recent_trades, BINANCE_TRADE_COLUMNS)
+                    df_binance_trades = records_to_frame(recent_trades, available_cols)
                     if not df_binance_trades.empty:
-                        display_cols = ['symbol', 'price', 'qty', 'time', 'isBuyer']
-                        available_cols = [col for col in display_cols if col in df_binance_trades.columns]
                         st.dataframe(
-                            df_binance_trades[available_cols],
+                            df_binance_trades,
                             use_container_width=True,
                             height=300
                         )
@@ -230,13 +256,13 @@ class BinanceFirebaseComparison:
                 col2a.metric("📊 Total Bot", bot_total)
                 col2b.metric("✅ Complétés", completed_trades)
                 
-                # DataFrame des trades du bot
-                df_bot_trades = pd.DataFrame(bot_trades[:20])
+                # DataFrame des trades du bot, limité aux colonnes affichées
+                recent_bot_trades = bot_trades[:20]
+                available_cols = present_columns(recent_bot_trades, BOT_TRADE_COLUMNS)
+                df_bot_trades = records_to_frame(recent_bot_trades, available_cols)
                 if not df_bot_trades.empty:
-                    display_cols = ['pair', 'side', 'price', 'quantity', 'status']
-                    available_cols = [col for col in display_cols if col in df_bot_trades.columns]
                     st.dataframe(
-                        df_bot_trades[available_cols],
+                        df_bot_trades,
                         use_container_width=True,
                         height=300
                     )
@@ -266,12 +292,11 @@ class BinanceFirebaseComparison:
         
         # DataFrame des ordres
         if orders:
-            df_orders = pd.DataFrame(orders)
-            display_cols = ['symbol', 'side', 'type', 'price', 'origQty', 'status']
-            available_cols = [col for col in display_cols if col in df_orders.columns]
+            available_cols = present_columns(orders, ORDER_COLUMNS)
+            df_orders = records_to_frame(orders, available_cols)
             
             st.dataframe(
-                df_orders[available_cols],
+                df_orders,
                 use_container_width=True
             )
     
@@ -317,8 +342,7 @@ class BinanceFirebaseComparison:
         
         # Récupération des données
         with st.spinner("📡 Récupération des données..."):
-            account_data, trades_data, orders_data, health_data = self.get_binance_live_data()
-            bot_trades = self.get_bot_trades_data()
+            (account_data, trades_data, orders_data, health_data), bot_trades = self.fetch_page_data()
         
         # Onglets pour organiser l'affichage
         tab1, tab2, tab3, tab4 = st.tabs(["🔍 Statut", "💼 Comptes", "🔄 Trades", "📋 Ordres"])
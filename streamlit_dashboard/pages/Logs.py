@@ -28,6 +28,12 @@ st_autorefresh(interval=10000, key="logs_refresh")
 # Ajout du répertoire parent au path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
+def format_timestamp(value, fmt: str) -> str:
+    """Formate un horodatage Firestore (datetime natif) sans repasser par le parseur pandas"""
+    if isinstance(value, datetime):
+        return value.strftime(fmt)
+    return pd.to_datetime(value, utc=True, errors='coerce').strftime(fmt)
+
 def init_firebase():
     """Initialise Firebase si pas déjà fait"""
     try:
@@ -112,6 +118,10 @@ def main():
     if not db:
         st.stop()
     
+    # Signaux lus une seule fois par rerun: l'onglet Signaux affiche les 30 premiers,
+    # les statistiques portent sur les 50
+    recent_signals = get_signals_logs(db, 50)
+    
     # Onglets pour différents types de logs
     tab1, tab2, tab3, tab4 = st.tabs(["🔄 Logs Console", "📶 Signaux", "⛔ Paires Rejetées", "📊 Statistiques"])
     
@@ -127,8 +137,9 @@ def main():
         with col3:
             limit = st.slider("Nombre de logs", 10, 200, 50)
         
-        # Récupération et affichage des logs
-        logs = get_recent_logs(db, limit)
+        # Récupération unique des logs (fenêtre des statistiques incluse), puis découpe locale
+        recent_logs = get_recent_logs(db, max(limit, 100))
+        logs = recent_logs[:limit]
         if logs:
             # Filtrer selon les critères
             if level_filter != "Tous":
@@ -137,9 +148,9 @@ def main():
                 logs = [log for log in logs if log.get('module') == module_filter]
             
             # Créer DataFrame pour affichage
-            df_logs = pd.DataFrame(logs)
+            df_logs = pd.DataFrame.from_records(logs, columns=['timestamp', 'level', 'module', 'message'])
             if not df_logs.empty:
-                df_logs['time'] = pd.to_datetime(df_logs['timestamp']).dt.strftime('%H:%M:%S')
+                df_logs['time'] = pd.to_datetime(df_logs['timestamp'], utc=True, cache=True, errors='coerce').dt.strftime('%H:%M:%S')
                 
                 # Style selon le niveau
                 def color_level(level):
@@ -163,10 +174,10 @@ def main():
         st.subheader("📶 Signaux de Trading")
         
         # Récupération des signaux
-        signals = get_signals_logs(db, 30)
+        signals = recent_signals[:30]
         if signals:
             for signal in signals:
-                time_str = pd.to_datetime(signal['timestamp']).strftime('%H:%M:%S')
+                time_str = format_timestamp(signal['timestamp'], '%H:%M:%S')
                 pair = signal.get('pair', 'N/A')
                 
                 if signal.get('is_valid_signal', False):
@@ -186,7 +197,7 @@ def main():
         rejections = get_pair_rejections(db, 20)
         if rejections:
             for rejection in rejections:
-                time_str = pd.to_datetime(rejection['timestamp']).strftime('%H:%M:%S')
+                time_str = format_timestamp(rejection['timestamp'], '%H:%M:%S')
                 pair = rejection.get('pair', 'N/A')
                 reason = rejection.get('rejection_reason', 'N/A')
                 
@@ -208,7 +219,7 @@ def main():
         st.subheader("📊 Statistiques en Temps Réel")
         
         # Statistiques rapides depuis les logs
-        logs = get_recent_logs(db, 100)
+        logs = recent_logs[:100]
         if logs:
             log_counts = {}
             for log in logs:
@@ -226,7 +237,7 @@ def main():
                 st.metric("⚪ DEBUG", log_counts.get('DEBUG', 0))
         
         # Statistiques signaux
-        signals = get_signals_logs(db, 50)
+        signals = recent_signals
         if signals:
             valid_signals = sum(1 for s in signals if s.get('is_valid_signal', False))
             st.metric("📶 Signaux Valides", valid_signals, f"sur {len(signals)} analysés")
@@ -235,7 +246,7 @@ def main():
         st.markdown("### ⏰ Dernière Activité")
         if logs:
             last_log = logs[0]
-            last_time = pd.to_datetime(last_log['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
+            last_time = format_timestamp(last_log['timestamp'], '%Y-%m-%d %H:%M:%S')
             st.success(f"Dernière activité: {last_time}")
         else:
             st.warning("Aucune activité récente détectée")
@@ -250,12 +250,19 @@ class TradesPage:
             np.random.seed(42)
             pnl_data = np.random.normal(5, 15, 200)
             
-            fig = px.histogram(
-                x=pnl_data,
-                nbins=30,
+            # Comptage par classe fait ici: le graphique ne reçoit que 30 barres, pas les trades bruts
+            counts, edges = np.histogram(pnl_data, bins=30)
+            fig = go.Figure(go.Bar(
+                x=(edges[:-1] + edges[1:]) / 2,
+                y=counts,
+                width=np.diff(edges),
+                marker_color='#00ff88'
+            ))
+            fig.update_layout(
                 title="Distribution des P&L",
-                labels={'x': 'P&L (USDC)', 'y': 'Nombre de Trades'},
-                color_discrete_sequence=['#00ff88']
+                xaxis_title='P&L (USDC)',
+                yaxis_title='Nombre de Trades',
+                bargap=0
             )
             
             # Ligne médiane
@@ -8,7 +8,7 @@ import asyncio
 import logging
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any
 
 try:
     import telegram
@@ -33,6 +33,9 @@ class NotificationConfig:
 class TelegramNotifier:
     """Gestionnaire de notifications Telegram pour RSI Scalping"""
     
+    # Taille maximale d'un message Telegram
+    MAX_MESSAGE_LENGTH = 4096
+    
     def __init__(self, bot_token: str, chat_id: str, config: Optional[NotificationConfig] = None, trading_config=None):
         self.bot_token = bot_token
         self.chat_id = chat_id
@@ -40,6 +43,9 @@ class TelegramNotifier:
         self.trading_config = trading_config  # Configuration de trading pour les valeurs dynamiques
         self.logger = logging.getLogger(__name__)
         
+        # Messages différés, envoyés regroupés par flush_messages()
+        self._pending_messages: List[str] = []
+        
         # Initialisation du bot
         self.bot = None
         if telegram and bot_token and chat_id:
@@ -83,6 +89,38 @@ class TelegramNotifier:
             self.logger.error(f"❌ Erreur inattendue Telegram: {e}")
             return False
 
+    def queue_message(self, message: str):
+        """Met un message en attente; il partira regroupé avec les autres au prochain flush_messages()"""
+        if self.bot:
+            self._pending_messages.append(message.strip())
+    
+    async def flush_messages(self) -> bool:
+        """Envoie les messages en attente en un minimum d'appels API (blocs de 4096 caractères)
+        
+        Appelé une fois par itération de la boucle principale: les messages d'une même
+        itération partent ensemble, sans délai supplémentaire.
+        """
+        if not self._pending_messages:
+            return False
+        
+        messages, self._pending_messages = self._pending_messages, []
+        
+        chunks = []
+        current = ""
+        for message in messages:
+            message = message[:self.MAX_MESSAGE_LENGTH]
+            if current and len(current) + 2 + len(message) > self.MAX_MESSAGE_LENGTH:
+                chunks.append(current)
+                current = message
+            else:
+                current = f"{current}\n\n{message}" if current else message
+        chunks.append(current)
+        
+        sent = True
+        for chunk in chunks:
+            sent = await self.send_message(chunk) and sent
+        return sent
+
     async def send_start_notification(self, capital: float):
         """Notification de démarrage du bot RSI Scalping"""
         if not self.config.send_start:
@@ -298,8 +336,11 @@ class TelegramNotifier:
         await self.send_message(message)
         self.logger.info("📱 Notification résumé quotidien envoyée")
 
-    async def send_error_notification(self, error_data: Dict[str, Any]):
-        """Notification d'erreur"""
+    async def send_error_notification(self, error_data: Dict[str, Any], defer: bool = False):
+        """Notification d'erreur
+        
+        defer=True met la notification en attente (envoi regroupé par flush_messages()).
+        """
         if not self.config.send_errors:
             return
         
@@ -321,6 +362,10 @@ class TelegramNotifier:
 *Vérifiez les logs pour plus de détails.*
 """
         
+        if defer:
+            self.queue_message(message)
+            return
+        
         await self.send_message(message)
         self.logger.info("📱 Notification erreur envoyée")
 
@@ -403,6 +448,28 @@ class TelegramNotifier:
         
         await self.send_message(message)
 
+    async def initialize(self) -> bool:
+        """Ouvre une fois pour toutes le pool de connexions HTTPS du bot Telegram (réutilisé par chaque envoi)"""
+        if not self.bot:
+            return False
+        
+        try:
+            await self.bot.initialize() # type: ignore
+            return True
+        except Exception as e:
+            self.logger.error(f"❌ Erreur initialisation connexion Telegram: {e}")
+            return False
+
+    async def close(self):
+        """Ferme le pool de connexions HTTPS du bot Telegram"""
+        if not self.bot:
+            return
+        
+        try:
+            await self.bot.shutdown() # type: ignore
+        except Exception as e:
+            self.logger.error(f"❌ Erreur fermeture connexion Telegram: {e}")
+
     async def test_connection(self) -> bool:
         """Test la connexion Telegram"""
         if not self.bot:
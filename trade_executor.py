@@ -129,6 +129,9 @@ class TradeExecutor:
         self.is_paused = False
         self.pause_until = None
         
+        # Tâches de logging en arrière-plan (références gardées jusqu'à leur fin)
+        self._background_tasks = set()
+        
         # Indicateurs techniques
         from indicators import TechnicalIndicators
         self.indicators = TechnicalIndicators(config)
@@ -324,8 +327,8 @@ class TradeExecutor:
             self.last_trade_time = datetime.now()
             self.trade_timestamps.append(datetime.now())
             
-            # Logging
-            await self._log_trade_open(trade)
+            # Logging en arrière-plan: ne retarde pas l'appelant (sauvegarde d'état, scan suivant)
+            self._run_in_background(self._log_trade_open(trade))
             
             self.logger.info(f"✅ Trade ouvert: {pair} à {current_price:.6f} USDC")
             return trade
@@ -383,6 +386,15 @@ class TradeExecutor:
                 total_qty = sum(float(fill['qty']) for fill in order['fills'])
                 avg_price = total_cost / total_qty if total_qty > 0 else trade.entry_price
                 trade.entry_price = avg_price
+                
+                # Quantité réellement détenue: exécutée (arrondie au pas du lot) moins la commission
+                # prélevée sur l'actif de base; c'est elle qui sert aux ordres de sortie et au suivi
+                base_asset = trade.pair[:-4]
+                commission = sum(float(fill['commission']) for fill in order['fills']
+                                 if fill.get('commissionAsset') == base_asset)
+                executed_qty = float(order.get('executedQty', total_qty))
+                if executed_qty > commission:
+                    trade.quantity = executed_qty - commission
             
             self.logger.info(f"✅ Ordre d'achat exécuté: {trade.pair}")
             return True
@@ -742,6 +754,18 @@ class TradeExecutor:
         self.trade_timestamps = []
         self.logger.info("🔄 Statistiques quotidiennes remises à zéro")
     
+    def _run_in_background(self, coro):
+        """Planifie une coroutine sans l'attendre, en gardant une référence à la tâche"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+    
+    async def wait_background_tasks(self):
+        """Attend la fin des logs en arrière-plan (arrêt du bot)"""
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+    
     async def _log_trade_open(self, trade: Trade):
         """Log l'ouverture d'un trade"""
         try:
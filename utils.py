@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+🔧 UTILITAIRES COMMUNS
+Fonctions partagées par les points d'entrée du bot et du service Binance Live
+"""
+
+import asyncio
+import sys
+
+
+def setup_event_loop_policy():
+    """Configure la boucle asyncio avant asyncio.run()
+
+    Windows: boucle Proactor. Linux/macOS: uvloop (boucle libuv, plus rapide pour
+    les I/O réseau) si installé, boucle standard sinon.
+    """
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+        return
+
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass